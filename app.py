@@ -4,9 +4,15 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+import functools
 import warnings
 warnings.filterwarnings("ignore")
 
+from superstore import cube as cubes, currency, duck, engine, figures, grid, lazy, parallel, partitions, perf, pyramid, store, warmup
+from superstore.cache import TTL, Budget, LRUCache
+from superstore.registry import Registry
+from superstore.export import FORMATS, export
+
 # ═══════════════════════════════════════════════════════════════
 #  PAGE CONFIG
 # ═══════════════════════════════════════════════════════════════
@@ -278,38 +284,24 @@ def _apply(fig, title="", h=360):
 def get_rate():
     return st.session_state.get("usd_rate", 83.5)
 
+# currency is presentation only: aggregates stay cached in USD, labels convert
 def fmt(val, inr=False):
     """Compact currency string — complete, never truncated."""
-    if inr:
-        v = val * get_rate()
-        if v >= 1_00_00_000: return f"₹{v/1_00_00_000:.2f} Cr"
-        if v >= 1_00_000:    return f"₹{v/1_00_000:.2f} L"
-        return f"₹{v:,.0f}"
-    if val >= 1_000_000: return f"${val/1_000_000:.2f}M"
-    if val >= 1_000:     return f"${val/1_000:.1f}K"
-    return f"${val:,.2f}"
+    return currency.fmt(val, get_rate() if inr else None)
 
 def fmt_words(val, inr=False):
     """Full value in words — shown below the compact number."""
-    if inr:
-        v = val * get_rate()
-        if v >= 1_00_00_000:
-            cr  = int(v // 1_00_00_000)
-            lkh = int((v % 1_00_00_000) // 1_00_000)
-            return f"{cr} Crore {lkh} Lakh" if lkh else f"{cr} Crore"
-        if v >= 1_00_000:
-            lkh = int(v // 1_00_000)
-            th  = int((v % 1_00_000) // 1_000)
-            return f"{lkh} Lakh {th} Thousand" if th else f"{lkh} Lakh"
-        return f"₹{v:,.0f}"
-    # USD words
-    if val >= 1_000_000:
-        m = int(val // 1_000_000)
-        k = int((val % 1_000_000) // 1_000)
-        return f"{m} Million {k} Thousand" if k else f"{m} Million"
-    if val >= 1_000:
-        return f"{int(val):,}"
-    return ""
+    return currency.fmt_words(val, get_rate() if inr else None)
+
+def fmt_all(values, inr=False):
+    """fmt() of a whole column at once."""
+    return currency.labels(values, get_rate() if inr else None)
+
+def fmt_bytes(n):
+    """Human-readable byte count."""
+    if n >= 1024**3: return f"{n/1024**3:.2f} GB"
+    if n >= 1024**2: return f"{n/1024**2:.1f} MB"
+    return f"{n/1024:.0f} KB"
 
 def kpi(col, accent, label, value_str, delta, up=True, words=""):
     # kept for signature compat but not used — see KPI ROW below
@@ -338,6 +330,52 @@ def nodata(col_name, tip=""):
 if "inr" not in st.session_state:
     st.session_state.inr = False
 
+# ─── Instrumentation — one trace per rerun, history per session ──
+PERF_HISTORY = 50
+st.session_state.setdefault("perf_session", perf.new_session())
+st.session_state.perf_run = st.session_state.get("perf_run", 0) + 1
+trace = perf.Trace(st.session_state.perf_session, st.session_state.perf_run)
+
+def chart(build, *inputs, money=False, **kwargs):
+    """st.plotly_chart of `build()`'s figure, cached under the chart id (`build`'s name),
+    the content of the `inputs` it draws and — for `money` charts — the label currency."""
+    name, rate = build.__name__, get_rate() if money and INR else None
+    with trace.stage(f"figure: {name}"):
+        key = (name, figures.fingerprint(*inputs), "INR" if rate else "USD", rate)
+        fig, hit = figure_cache().get(key, build)
+    trace.records[-1]["cache"] = "hit" if hit else "miss"
+    with trace.stage(f"chart: {name}"):
+        return st.plotly_chart(fig, use_container_width=True, **kwargs)
+
+# ─── Trend charts — granularity from the time pyramid, drilldown by selection ──
+TREND_LEVELS = ["Auto", *pyramid.LEVELS]
+
+def trend_controls(key):
+    """Granularity selector + drilldown window of one trend chart → (level, window)."""
+    window = st.session_state.get(f"{key}_window")
+    lo, hi = view.span(window)
+    if lo > hi:  # zoomed outside a since-changed date filter
+        del st.session_state[f"{key}_window"]
+        window, (lo, hi) = None, view.span()
+    c1, c2 = st.columns([5, 1])
+    with c1:
+        choice = st.radio("Granularity", TREND_LEVELS, horizontal=True,
+                          label_visibility="collapsed", key=f"{key}_level")
+    if window:
+        c2.button("↺ Reset zoom", key=f"{key}_reset", use_container_width=True,
+                  on_click=lambda: st.session_state.pop(f"{key}_window", None))
+    level = pyramid.auto(lo, hi) if choice == "Auto" else choice
+    st.caption(f"{pyramid.LEVELS[level]} · {lo:%d %b %Y} – {hi:%d %b %Y} · "
+               "click a bar or box-select a range to drill down")
+    return level, window
+
+def drill(key, level):
+    """on_select of a trend chart: narrow its window to the selected periods."""
+    days = sorted(pd.Timestamp(p["x"]) for p in st.session_state[key].selection.points)
+    if days:
+        st.session_state[f"{key}_window"] = (pyramid.period(days[0], level)[0],
+                                             pyramid.period(days[-1], level)[1])
+
 # ═══════════════════════════════════════════════════════════════
 #  BANNER
 # ═══════════════════════════════════════════════════════════════
@@ -364,8 +402,14 @@ st.markdown(f"""
 #  FILE UPLOAD
 # ═══════════════════════════════════════════════════════════════
 uploaded = st.file_uploader("CSV", type=["csv"], label_visibility="collapsed")
+data_dir = st.text_input("Dataset directory", label_visibility="collapsed",
+                         placeholder="…or open a local month-partitioned dataset directory "
+                                     "(python -m superstore.partitions DIR extract.csv)").strip()
+if data_dir and uploaded is None and partitions.bounds(data_dir) is None:
+    st.error(f"❌ No `year=YYYY/month=MM` partitions found under `{data_dir}`.")
+    st.stop()
 
-if uploaded is None:
+if uploaded is None and not data_dir:
     st.markdown("""
     <div class="uzone">
         <div class="u-ico">📂</div>
@@ -386,24 +430,80 @@ if uploaded is None:
         </div>""", unsafe_allow_html=True)
     st.stop()
 
+# files this big default to chunked streaming ingest (exact aggregates + row sample)
+STREAM_BYTES = 512 * 1024**2
+streaming = uploaded is not None and st.toggle(
+    "⚡ Streaming ingest — aggregate in chunks (for very large files)",
+    value=uploaded.size >= STREAM_BYTES)
+
 # ═══════════════════════════════════════════════════════════════
 #  LOAD DATA
 # ═══════════════════════════════════════════════════════════════
-@st.cache_data
-def load(f):
-    df = pd.read_csv(f)
-    for c in ["Order Date","Ship Date"]:
-        if c in df.columns:
-            df[c] = pd.to_datetime(df[c], dayfirst=True, errors="coerce")
-    return df
-
-df = load(uploaded)
+# keyed by content hash + load mode — the upload itself is not re-hashed by
+# Streamlit, the parsed frame also persists on disk across sessions and restarts,
+# and every session gets the same Dataset (rows, cube, filter indexes): memory
+# grows with distinct datasets, not with users. Datasets and aggregates share one
+# memory budget (SUPERSTORE_MEMORY_BUDGET); entries idle for SUPERSTORE_CACHE_TTL expire
+@st.cache_resource
+def memory_budget():
+    return Budget()
+
+@st.cache_resource
+def datasets():
+    return memory_budget().add(Registry(ttl=TTL))
+
+def build(df, mem, cube=None, streaming=False):
+    """Profile + index a loaded frame (the cube rolls YM / DayOfWeek up once)."""
+    if cube is None:
+        with trace.stage("cube"):
+            cube = cubes.aggregate(df)
+    with trace.stage("dataset"):
+        return engine.Dataset(df, cube, mem, streaming)
+
+def load_upload(f):
+    return build(*store.load(f, digest))
+
+def load_partitions(paths):
+    # only the partitions overlapping the sidebar date range are read
+    return build(*partitions.read(paths))
+
+def load_streaming(f):
+    bar = st.progress(0.0, text="Streaming CSV…")
+    df, cube, mem = cubes.stream(f, on_progress=lambda p, n: bar.progress(
+        p, text=f"Streaming CSV… {n:,} rows"))
+    bar.empty()
+    return build(df, mem, cube, streaming=True)
+
+if uploaded is not None:
+    with trace.stage("hash"):
+        digest = store.content_hash(uploaded)
+if uploaded is None:
+    # prune to the months of the sidebar date range — read from its widget state,
+    # as the sidebar is drawn after loading; an empty selection reads every month
+    every = partitions.files(data_dir, *partitions.bounds(data_dir))
+    wanted = st.session_state.get("date_range") or ()
+    paths = (partitions.files(data_dir, *wanted) if len(wanted) == 2 else []) or every
+    with trace.stage("load"):
+        mode, digest = "partitions", partitions.fingerprint(paths)
+        ds = datasets().get((mode, digest), lambda: load_partitions(paths),
+                            st.session_state.perf_session)
+    st.caption(f"📁 `{data_dir}` — {len(paths):,} of {len(every):,} partition files read "
+               "for the selected dates")
+else:
+    mode = "streaming" if streaming else "upload"
+    with trace.stage("load"):
+        ds = datasets().get((mode, digest), lambda: (load_streaming if streaming else load_upload)(uploaded),
+                            st.session_state.perf_session)
+    if streaming:
+        st.info(f"⚡ Streaming mode — {ds.mem['rows']:,} rows aggregated in chunks. KPIs and charts are exact; "
+                f"top products, distributions and the Data Explorer use a uniform sample of {len(ds.df):,} rows. "
+                "The date filter applies to whole months (to the day for the trend charts).")
+df, mem = ds.df, ds.mem
 
 # validate required cols
-for req in ["Sales","Region","Category"]:
-    if req not in df.columns:
-        st.error(f"❌ Required column missing: **{req}**. Please upload the correct Superstore file.")
-        st.stop()
+for req in ds.missing():
+    st.error(f"❌ Required column missing: **{req}**. Please upload the correct Superstore file.")
+    st.stop()
 
 # ═══════════════════════════════════════════════════════════════
 #  SIDEBAR  — Filters + Currency toggle
@@ -429,62 +529,101 @@ with st.sidebar:
 
     date_range = None
     if "Order Date" in df.columns:
-        dmin, dmax = df["Order Date"].min().date(), df["Order Date"].max().date()
-        date_range = st.date_input("📅 Date range", [dmin, dmax], min_value=dmin, max_value=dmax)
+        dmin, dmax = ds.date_bounds() if uploaded is not None else partitions.bounds(data_dir)
+        date_range = st.date_input("📅 Date range", [dmin, dmax], min_value=dmin, max_value=dmax,
+                                   key="date_range" if uploaded is None else None)
 
-    regs  = sorted(df["Region"].dropna().unique())
-    cats  = sorted(df["Category"].dropna().unique())
+    regs  = ds.options("Region")
+    cats  = ds.options("Category")
     s_reg = st.multiselect("🌍 Region",   regs, default=regs)
     s_cat = st.multiselect("🏷️ Category", cats, default=cats)
 
     s_seg  = None
     s_ship = None
     if "Segment" in df.columns:
-        segs  = sorted(df["Segment"].dropna().unique())
+        segs  = ds.options("Segment")
         s_seg = st.multiselect("👥 Segment", segs, default=segs)
     if "Ship Mode" in df.columns:
-        ships  = sorted(df["Ship Mode"].dropna().unique())
+        ships  = ds.options("Ship Mode")
         s_ship = st.multiselect("🚚 Ship Mode", ships, default=ships)
 
+    # optional engines run filters + chart aggregations over the full rows (not the streaming sample)
+    backend  = "pandas"
+    backends = ["pandas"] + ["DuckDB"] * duck.AVAILABLE + ["Polars"] * lazy.AVAILABLE
+    if len(backends) > 1 and not streaming:
+        st.markdown("---")
+        backend = st.radio("⚙️ Query engine", backends, horizontal=True,
+                           help="DuckDB pushes filters and aggregations down as multi-threaded SQL; "
+                                "Polars runs them as one multi-threaded lazy query plan.")
+
     st.markdown("---")
     st.caption("Superstore Analytics v2.2")
 
 # ═══════════════════════════════════════════════════════════════
 #  APPLY FILTERS
 # ═══════════════════════════════════════════════════════════════
-fdf = df.copy()
-if date_range and len(date_range) == 2 and "Order Date" in df.columns:
-    fdf = fdf[(fdf["Order Date"].dt.date >= date_range[0]) &
-              (fdf["Order Date"].dt.date <= date_range[1])]
-if s_reg:  fdf = fdf[fdf["Region"].isin(s_reg)]
-if s_cat:  fdf = fdf[fdf["Category"].isin(s_cat)]
-if s_seg  and "Segment"  in df.columns: fdf = fdf[fdf["Segment"].isin(s_seg)]
-if s_ship and "Ship Mode" in df.columns: fdf = fdf[fdf["Ship Mode"].isin(s_ship)]
-
-if fdf.empty:
+selections = {"Region": s_reg, "Category": s_cat, "Segment": s_seg, "Ship Mode": s_ship}
+
+# ─── Aggregation cache — shared by all sessions, keyed by filter signature ──
+AGG_CACHE_ENTRIES = 512
+
+@st.cache_resource
+def agg_cache():
+    return memory_budget().add(LRUCache(AGG_CACHE_ENTRIES, TTL, "aggregates"))
+
+# built figures, keyed by chart + content hash of what they draw + label currency
+FIGURE_CACHE_ENTRIES = 256
+
+@st.cache_resource
+def figure_cache():
+    return memory_budget().add(figures.FigureCache(FIGURE_CACHE_ENTRIES, TTL))
+
+# the optional engines' per-dataset state (Polars holds its own copy of the rows) lives
+# in the registry too, under the budget; large datasets on pandas are scanned by a
+# worker pool over memory-mapped columns
+engines = {"DuckDB": lambda: duck.Dataset(ds), "Polars": lambda: lazy.Dataset(ds),
+           "parallel": lambda: parallel.Dataset(ds, digest)}
+engine_name = "parallel" if backend == "pandas" and parallel.worth(ds) else backend
+source = ds if engine_name == "pandas" else datasets().get(
+    (engine_name, mode, digest), engines[engine_name], st.session_state.perf_session)
+
+def signature(digest, streaming, backend, date_range, selections):
+    """Aggregation cache key prefix of one dataset + engine + filter state."""
+    return (digest, streaming, backend, tuple(date_range or ()),
+            *(tuple(sorted(v or ())) for v in selections.values()))
+
+filter_sig = signature(digest, streaming, backend, date_range, selections)
+
+def cached(name, compute):
+    """Memoize an aggregation for the current dataset + filters (read-only result)."""
+    miss = []
+    with trace.stage(f"agg: {name[0] if isinstance(name, tuple) else name}"):
+        value = agg_cache().get((*filter_sig, name), lambda: miss.append(1) or compute())
+    trace.records[-1]["cache"] = "miss" if miss else "hit"
+    return value
+
+# every KPI / chart table comes from the engine view, memoized in the cache above
+with trace.stage("filters"):
+    view = source.view(date_range, selections, memo=cached)
+(total_sales, total_orders, avg_order, total_profit,
+ margin_pct, total_qty, unique_cust) = view.kpis()
+
+if not total_orders:
     st.warning("⚠️ No data matches your filters — please widen your selection.")
     st.stop()
 
 # ─── Shorthand flags ──────────────────────────────────────────
 INR        = st.session_state.inr
-HAS_PROFIT = "Profit"       in fdf.columns
-HAS_QTY    = "Quantity"     in fdf.columns
-HAS_DISC   = "Discount"     in fdf.columns
-HAS_DATE   = "Order Date"   in fdf.columns
-HAS_STATE  = "State"        in fdf.columns
-HAS_SUBCAT = "Sub-Category" in fdf.columns
-HAS_PROD   = "Product Name" in fdf.columns
-HAS_SEG    = "Segment"      in fdf.columns
-HAS_SHIP   = "Ship Mode"    in fdf.columns
-HAS_CUST   = "Customer ID"  in fdf.columns
-
-total_sales   = fdf["Sales"].sum()
-total_orders  = fdf.shape[0]
-avg_order     = fdf["Sales"].mean()
-total_profit  = fdf["Profit"].sum() if HAS_PROFIT else 0
-margin_pct    = (total_profit / total_sales * 100) if HAS_PROFIT and total_sales else 0
-total_qty     = fdf["Quantity"].sum() if HAS_QTY else None
-unique_cust   = fdf["Customer ID"].nunique() if HAS_CUST else total_orders
+HAS_PROFIT = "Profit"       in df.columns
+HAS_QTY    = "Quantity"     in df.columns
+HAS_DISC   = "Discount"     in df.columns
+HAS_DATE   = "Order Date"   in df.columns
+HAS_STATE  = "State"        in df.columns
+HAS_SUBCAT = "Sub-Category" in df.columns
+HAS_PROD   = "Product Name" in df.columns
+HAS_SEG    = "Segment"      in df.columns
+HAS_SHIP   = "Ship Mode"    in df.columns
+HAS_CUST   = "Customer ID"  in df.columns
 
 # ═══════════════════════════════════════════════════════════════
 #  KPI ROW  — all values on one clean line
@@ -530,317 +669,346 @@ c5 = _card("kpi-teal",   "Avg Order Value",
 
 c6 = _card("kpi-sky",    "Customers",
            f"{unique_cust:,}", "",
-           "unique buyers" if HAS_CUST else "rows (no Customer ID col)")
+           ("unique buyers in sample" if streaming else "unique buyers") if HAS_CUST
+           else "rows (no Customer ID col)")
 
 st.markdown(
     f'<div style="display:flex;gap:12px;margin-bottom:1rem;">{c1}{c2}{c3}{c4}{c5}{c6}</div>',
     unsafe_allow_html=True
 )
+trace.lap("kpi_row")
 
 st.markdown("<div style='height:1rem'></div>", unsafe_allow_html=True)
 
-#  TABS
+#  TABS — lazy: only the open tab's body runs on a rerun
 
-tab1,tab2,tab3,tab4,tab5 = st.tabs([
+tabs = st.tabs([
     " Sales Trends"," Regional"," Products"," Profitability"," Data Explorer"
-])
+], key="section", on_change="rerun")
 
-─
 # TAB 1 — SALES TRENDS─
-with tab1:
+def tab_sales_trends():
     if not HAS_DATE:
         nodata("Order Date",
                "Add an <b>Order Date</b> column (DD/MM/YYYY or MM/DD/YYYY) "
                "to unlock time-series charts, YoY comparison, and trend analysis.")
     else:
-        _f = fdf.copy()
-        _f["YM"] = _f["Order Date"].dt.to_period("M").dt.to_timestamp()
-
-        hdr("📈", "Monthly Revenue & Order Volume")
-        mon = _f.groupby("YM").agg(Sales=("Sales","sum"), Orders=("Sales","count")).reset_index()
-        mon["MA3"] = mon["Sales"].rolling(3, min_periods=1).mean()
-
-        fig = make_subplots(specs=[[{"secondary_y":True}]])
-        fig.add_trace(go.Bar(
-            x=mon["YM"], y=mon["Sales"], name="Revenue",
-            marker_color="rgba(96,165,250,0.3)",
-            marker_line_color="rgba(96,165,250,0.5)", marker_line_width=1,
-        ), secondary_y=False)
-        fig.add_trace(go.Scatter(
-            x=mon["YM"], y=mon["MA3"], name="3-mo MA",
-            line=dict(color="#60a5fa", width=2.5, dash="dot"),
-        ), secondary_y=False)
-        fig.add_trace(go.Scatter(
-            x=mon["YM"], y=mon["Orders"], name="Orders",
-            line=dict(color="#fbbf24", width=2),
-            mode="lines+markers", marker=dict(size=4),
-        ), secondary_y=True)
-        fig.update_layout(**_BG, height=370,
-                          title="Monthly Revenue (bars) + Order Count (right axis)")
-        fig.update_xaxes(**_XA)
-        fig.update_yaxes(title_text="Revenue", gridcolor="rgba(255,255,255,0.04)",
-                         tickfont=dict(color="#475569",size=10), secondary_y=False)
-        fig.update_yaxes(title_text="Orders", gridcolor="rgba(0,0,0,0)",
-                         tickfont=dict(color="#fbbf24",size=10), secondary_y=True)
-        st.plotly_chart(fig, use_container_width=True)
+        hdr("📈", "Revenue & Order Volume")
+        level, window = trend_controls("revenue_trend")
+        mon = view.trend(level, window)
+
+        def revenue_trend():
+            fig = make_subplots(specs=[[{"secondary_y":True}]])
+            fig.add_trace(go.Bar(
+                x=mon["Period"], y=mon["Sales"], name="Revenue",
+                marker_color="rgba(96,165,250,0.3)",
+                marker_line_color="rgba(96,165,250,0.5)", marker_line_width=1,
+            ), secondary_y=False)
+            fig.add_trace(go.Scatter(
+                x=mon["Period"], y=mon["MA3"], name=f"3-{level.lower()} MA",
+                line=dict(color="#60a5fa", width=2.5, dash="dot"),
+            ), secondary_y=False)
+            fig.add_trace(go.Scatter(
+                x=mon["Period"], y=mon["Orders"], name="Orders",
+                line=dict(color="#fbbf24", width=2),
+                mode="lines+markers", marker=dict(size=4),
+            ), secondary_y=True)
+            fig.update_layout(**_BG, height=370,
+                              title=f"{pyramid.LEVELS[level]} Revenue (bars) + Order Count (right axis)")
+            fig.update_xaxes(**_XA)
+            fig.update_yaxes(title_text="Revenue", gridcolor="rgba(255,255,255,0.04)",
+                             tickfont=dict(color="#475569",size=10), secondary_y=False)
+            fig.update_yaxes(title_text="Orders", gridcolor="rgba(0,0,0,0)",
+                             tickfont=dict(color="#fbbf24",size=10), secondary_y=True)
+            return fig
+        chart(revenue_trend, level, mon, key="revenue_trend", selection_mode=("points", "box"),
+              on_select=lambda: drill("revenue_trend", level))
 
         c1,c2 = st.columns(2)
         with c1:
             hdr("📅","Year-over-Year Comparison")
-            _f["Year"]  = _f["Order Date"].dt.year
-            _f["Month"] = _f["Order Date"].dt.month
-            yoy = _f.groupby(["Year","Month"])["Sales"].sum().reset_index()
-            fig = px.line(yoy, x="Month", y="Sales", color="Year",
-                          color_discrete_sequence=["#60a5fa","#34d399","#fbbf24","#a78bfa"],
-                          markers=True)
-            fig.update_layout(**_BG, height=310, title="Sales by Month (each year)")
-            fig.update_xaxes(**_XA, tickmode="array", tickvals=list(range(1,13)),
-                             ticktext=["Jan","Feb","Mar","Apr","May","Jun",
-                                       "Jul","Aug","Sep","Oct","Nov","Dec"])
-            fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            yoy = view.yoy()
+            def yoy_sales():
+                fig = px.line(yoy, x="Month", y="Sales", color="Year",
+                              color_discrete_sequence=["#60a5fa","#34d399","#fbbf24","#a78bfa"],
+                              markers=True)
+                fig.update_layout(**_BG, height=310, title="Sales by Month (each year)")
+                fig.update_xaxes(**_XA, tickmode="array", tickvals=list(range(1,13)),
+                                 ticktext=["Jan","Feb","Mar","Apr","May","Jun",
+                                           "Jul","Aug","Sep","Oct","Nov","Dec"])
+                fig.update_yaxes(**_YA)
+                return fig
+            chart(yoy_sales, yoy)
 
         with c2:
             hdr("🏷️","Category Revenue Over Time")
-            cm = _f.groupby(["YM","Category"])["Sales"].sum().reset_index()
-            fig = px.area(cm, x="YM", y="Sales", color="Category",
-                          color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"])
-            fig.update_traces(opacity=0.72)
-            fig.update_layout(**_BG, height=310, title="Category Trend")
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            cm = view.category_monthly()
+            def category_trend():
+                fig = px.area(cm, x="YM", y="Sales", color="Category",
+                              color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"])
+                fig.update_traces(opacity=0.72)
+                fig.update_layout(**_BG, height=310, title="Category Trend")
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(category_trend, cm)
 
         hdr("📆","Revenue by Day of Week")
         c1,c2 = st.columns(2)
         with c1:
-            _f["DayOfWeek"] = _f["Order Date"].dt.day_name()
-            day_ord = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
-            dow = _f.groupby("DayOfWeek")["Sales"].sum().reindex(day_ord).reset_index()
-            fig = px.bar(dow, x="DayOfWeek", y="Sales",
-                         color="Sales", color_continuous_scale=["#1e293b","#60a5fa"])
-            fig.update_layout(**_BG, height=290, title="Revenue by Order Day",
-                              showlegend=False, coloraxis_showscale=False)
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            dow = view.weekday()
+            def weekday_revenue():
+                fig = px.bar(dow, x="DayOfWeek", y="Sales",
+                             color="Sales", color_continuous_scale=["#1e293b","#60a5fa"])
+                fig.update_layout(**_BG, height=290, title="Revenue by Order Day",
+                                  showlegend=False, coloraxis_showscale=False)
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(weekday_revenue, dow)
 
         with c2:
             if HAS_SHIP:
-                ss = _f.groupby("Ship Mode")["Sales"].sum().reset_index().sort_values("Sales")
-                fig = px.bar(ss, x="Sales", y="Ship Mode", orientation="h",
-                             color="Sales", color_continuous_scale=["#1e293b","#34d399"])
-                fig.update_layout(**_BG, height=290, title="Revenue by Ship Mode",
-                                  showlegend=False, coloraxis_showscale=False)
-                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-                st.plotly_chart(fig, use_container_width=True)
+                ss = view.ship_mode()
+                def ship_mode_revenue():
+                    fig = px.bar(ss, x="Sales", y="Ship Mode", orientation="h",
+                                 color="Sales", color_continuous_scale=["#1e293b","#34d399"])
+                    fig.update_layout(**_BG, height=290, title="Revenue by Ship Mode",
+                                      showlegend=False, coloraxis_showscale=False)
+                    fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                    return fig
+                chart(ship_mode_revenue, ss)
             else:
                 nodata("Ship Mode")
 
 # TAB 2 — REGIONAL
-with tab2:
+def tab_regional():
     hdr("🗺️","Regional Performance")
     c1,c2 = st.columns(2)
 
-    reg = fdf.groupby("Region").agg(Sales=("Sales","sum"), Orders=("Sales","count")).reset_index()
-    reg["Share"] = (reg["Sales"]/reg["Sales"].sum()*100).round(1)
+    reg = view.region()
 
     with c1:
-        fig = go.Figure(go.Bar(
-            x=reg["Region"], y=reg["Sales"],
-            marker=dict(color=reg["Sales"],
-                        colorscale=[[0,"#1e293b"],[.5,"#2563eb"],[1,"#60a5fa"]],
-                        line=dict(color="rgba(96,165,250,0.2)",width=1)),
-            text=[fmt(v,INR) for v in reg["Sales"]],
-            textposition="outside",
-            textfont=dict(color="#e2e8f0", size=12),
-            cliponaxis=False,
-        ))
-        fig.update_layout(**_BG, title="Revenue by Region", height=360,
-                          yaxis=dict(range=[0, reg["Sales"].max() * 1.25],
-                                     gridcolor="rgba(255,255,255,0.04)",
-                                     tickfont=dict(color="#475569", size=10)))
-        fig.update_xaxes(**_XA)
-        st.plotly_chart(fig, use_container_width=True)
+        def region_revenue():
+            fig = go.Figure(go.Bar(
+                x=reg["Region"], y=reg["Sales"],
+                marker=dict(color=reg["Sales"],
+                            colorscale=[[0,"#1e293b"],[.5,"#2563eb"],[1,"#60a5fa"]],
+                            line=dict(color="rgba(96,165,250,0.2)",width=1)),
+                text=fmt_all(reg["Sales"], INR),
+                textposition="outside",
+                textfont=dict(color="#e2e8f0", size=12),
+                cliponaxis=False,
+            ))
+            fig.update_layout(**_BG, title="Revenue by Region", height=360,
+                              yaxis=dict(range=[0, reg["Sales"].max() * 1.25],
+                                         gridcolor="rgba(255,255,255,0.04)",
+                                         tickfont=dict(color="#475569", size=10)))
+            fig.update_xaxes(**_XA)
+            return fig
+        chart(region_revenue, reg, money=True)
 
     with c2:
-        total_s = reg["Sales"].sum()
-        fig = px.pie(reg, names="Region", values="Sales", hole=.6,
-                     color_discrete_sequence=["#60a5fa","#34d399","#fbbf24","#a78bfa"])
-        fig.update_traces(textposition="outside", textinfo="percent+label",
-                          marker=dict(line=dict(color="#080c18",width=2)))
-        fig.update_layout(**_BG, height=330, title="Revenue Share",
-                          annotations=[dict(text=fmt(total_s,INR),x=.5,y=.5,
-                                           font_size=17,font_color="#f1f5f9",showarrow=False)])
-        st.plotly_chart(fig, use_container_width=True)
+        def region_share():
+            total_s = reg["Sales"].sum()
+            fig = px.pie(reg, names="Region", values="Sales", hole=.6,
+                         color_discrete_sequence=["#60a5fa","#34d399","#fbbf24","#a78bfa"])
+            fig.update_traces(textposition="outside", textinfo="percent+label",
+                              marker=dict(line=dict(color="#080c18",width=2)))
+            fig.update_layout(**_BG, height=330, title="Revenue Share",
+                              annotations=[dict(text=fmt(total_s,INR),x=.5,y=.5,
+                                               font_size=17,font_color="#f1f5f9",showarrow=False)])
+            return fig
+        chart(region_share, reg, money=True)
 
     hdr("📍","Top & Bottom States by Revenue")
     if HAS_STATE:
-        sd = fdf.groupby("State")["Sales"].sum().reset_index().sort_values("Sales",ascending=False)
+        sd = view.state()
         c1,c2 = st.columns(2)
         with c1:
             t10 = sd.head(10).sort_values("Sales")
-            fig = px.bar(t10, x="Sales", y="State", orientation="h",
-                         color="Sales", color_continuous_scale=["#1e3a5f","#60a5fa"],
-                         text=[fmt(v,INR) for v in t10["Sales"]])
-            fig.update_traces(textposition="outside")
-            fig.update_layout(**_BG, height=350, title="🏆 Top 10 States",
-                              showlegend=False, coloraxis_showscale=False)
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            def top_states():
+                fig = px.bar(t10, x="Sales", y="State", orientation="h",
+                             color="Sales", color_continuous_scale=["#1e3a5f","#60a5fa"],
+                             text=fmt_all(t10["Sales"], INR))
+                fig.update_traces(textposition="outside")
+                fig.update_layout(**_BG, height=350, title="🏆 Top 10 States",
+                                  showlegend=False, coloraxis_showscale=False)
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(top_states, t10, money=True)
         with c2:
             b10 = sd.tail(10).sort_values("Sales",ascending=False)
-            fig = px.bar(b10, x="Sales", y="State", orientation="h",
-                         color="Sales", color_continuous_scale=["#f87171","#1e293b"],
-                         text=[fmt(v,INR) for v in b10["Sales"]])
-            fig.update_traces(textposition="outside")
-            fig.update_layout(**_BG, height=350, title="📉 Bottom 10 States",
-                              showlegend=False, coloraxis_showscale=False)
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            def bottom_states():
+                fig = px.bar(b10, x="Sales", y="State", orientation="h",
+                             color="Sales", color_continuous_scale=["#f87171","#1e293b"],
+                             text=fmt_all(b10["Sales"], INR))
+                fig.update_traces(textposition="outside")
+                fig.update_layout(**_BG, height=350, title="📉 Bottom 10 States",
+                                  showlegend=False, coloraxis_showscale=False)
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(bottom_states, b10, money=True)
     else:
         nodata("State","Add a <b>State</b> column to see state-level performance maps.")
 
     hdr("🔥","Region × Category Revenue Matrix")
-    piv = fdf.pivot_table(values="Sales",index="Region",columns="Category",aggfunc="sum").fillna(0)
-    fig = px.imshow(piv, color_continuous_scale=["#080c18","#1e3a5f","#60a5fa"],
-                    text_auto=".2s", aspect="auto")
-    fig.update_layout(**_BG, height=270, title="Sales Heatmap: Region vs Category")
-    st.plotly_chart(fig, use_container_width=True)
+    piv = view.region_category()
+    def region_category_heatmap():
+        fig = px.imshow(piv, color_continuous_scale=["#080c18","#1e3a5f","#60a5fa"],
+                        text_auto=".2s", aspect="auto")
+        fig.update_layout(**_BG, height=270, title="Sales Heatmap: Region vs Category")
+        return fig
+    chart(region_category_heatmap, piv)
 
 # TAB 3 — PRODUCTS
-with tab3:
+def tab_products():
     hdr("🏷️","Product Performance")
     c1,c2 = st.columns(2)
 
     with c1:
-        cd = fdf.groupby("Category")["Sales"].sum().reset_index()
-        fig = px.bar(cd, x="Category", y="Sales", color="Category",
-                     color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"],
-                     text=[fmt(v,INR) for v in cd["Sales"]])
-        fig.update_traces(textposition="outside")
-        fig.update_layout(**_BG, height=310, title="Revenue by Category", showlegend=False)
-        fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-        st.plotly_chart(fig, use_container_width=True)
+        cd = view.category_sales()
+        def category_revenue():
+            fig = px.bar(cd, x="Category", y="Sales", color="Category",
+                         color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"],
+                         text=fmt_all(cd["Sales"], INR))
+            fig.update_traces(textposition="outside")
+            fig.update_layout(**_BG, height=310, title="Revenue by Category", showlegend=False)
+            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+            return fig
+        chart(category_revenue, cd, money=True)
 
     with c2:
         if HAS_SUBCAT:
-            sub = fdf.groupby("Sub-Category")["Sales"].sum().sort_values().reset_index()
-            fig = px.bar(sub, x="Sales", y="Sub-Category", orientation="h",
-                         color="Sales", color_continuous_scale=["#1e293b","#60a5fa"])
-            fig.update_layout(**_BG, height=310, title="Revenue by Sub-Category",
-                              showlegend=False, coloraxis_showscale=False)
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            sub = view.subcategory_sales()
+            def subcategory_revenue():
+                fig = px.bar(sub, x="Sales", y="Sub-Category", orientation="h",
+                             color="Sales", color_continuous_scale=["#1e293b","#60a5fa"])
+                fig.update_layout(**_BG, height=310, title="Revenue by Sub-Category",
+                                  showlegend=False, coloraxis_showscale=False)
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(subcategory_revenue, sub)
         else:
             nodata("Sub-Category")
 
     hdr("🎯","Sub-Category: Sales vs Profit Bubble")
     if HAS_SUBCAT and HAS_PROFIT:
-        bub = fdf.groupby("Sub-Category").agg(
-            Sales=("Sales","sum"), Profit=("Profit","sum"), Orders=("Sales","count")
-        ).reset_index()
-        bub["Margin"] = (bub["Profit"]/bub["Sales"]*100).round(1)
-        fig = px.scatter(bub, x="Sales", y="Profit", size="Orders",
-                         text="Sub-Category", color="Margin",
-                         color_continuous_scale=["#f87171","#fbbf24","#34d399"], size_max=55)
-        fig.update_traces(textposition="top center", textfont=dict(size=9,color="#94a3b8"))
-        fig.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash")
-        fig.add_vline(x=bub["Sales"].mean(), line_color="rgba(255,255,255,0.08)", line_dash="dot")
-        fig.update_layout(**_BG, height=410,
-                          title="Sub-Category: Sales vs Profit  (bubble size = orders)")
-        fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-        st.plotly_chart(fig, use_container_width=True)
+        bub = view.subcategory()
+        def subcategory_bubble():
+            fig = px.scatter(bub, x="Sales", y="Profit", size="Orders",
+                             text="Sub-Category", color="Margin",
+                             color_continuous_scale=["#f87171","#fbbf24","#34d399"], size_max=55)
+            fig.update_traces(textposition="top center", textfont=dict(size=9,color="#94a3b8"))
+            fig.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash")
+            fig.add_vline(x=bub["Sales"].mean(), line_color="rgba(255,255,255,0.08)", line_dash="dot")
+            fig.update_layout(**_BG, height=410,
+                              title="Sub-Category: Sales vs Profit  (bubble size = orders)")
+            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+            return fig
+        chart(subcategory_bubble, bub)
     elif not HAS_SUBCAT:
         nodata("Sub-Category")
     else:
         nodata("Profit","Add a <b>Profit</b> column to see the profitability bubble chart.")
 
     if HAS_PROD:
-        hdr("🥇","Top 10 Products by Revenue")
-        tp = fdf.groupby("Product Name")["Sales"].sum().sort_values(ascending=False).head(10).reset_index()
-        tp["Short"] = tp["Product Name"].str[:44]
+        hdr("🥇","Top 10 Products by Revenue", "sample" if streaming else "")
+        tp = view.top_products()
         tps = tp.sort_values("Sales")
-        fig = px.bar(tps, x="Sales", y="Short", orientation="h",
-                     color="Sales", color_continuous_scale=["#1e3a5f","#60a5fa"],
-                     text=[fmt(v,INR) for v in tps["Sales"]])
-        fig.update_traces(textposition="outside")
-        fig.update_layout(**_BG, height=370, title="Top 10 Products",
-                          showlegend=False, coloraxis_showscale=False, yaxis_title="")
-        fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-        st.plotly_chart(fig, use_container_width=True)
+        def top_products():
+            fig = px.bar(tps, x="Sales", y="Short", orientation="h",
+                         color="Sales", color_continuous_scale=["#1e3a5f","#60a5fa"],
+                         text=fmt_all(tps["Sales"], INR))
+            fig.update_traces(textposition="outside")
+            fig.update_layout(**_BG, height=370, title="Top 10 Products",
+                              showlegend=False, coloraxis_showscale=False, yaxis_title="")
+            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+            return fig
+        chart(top_products, tps, money=True)
     else:
         nodata("Product Name","Add a <b>Product Name</b> column to see the top-10 product leaderboard.")
 
 # TAB 4 — PROFITABILITY
-with tab4:
+def tab_profitability():
     if not HAS_PROFIT:
         nodata("Profit",
                "Your dataset doesn't have a <b>Profit</b> column. "
                "Add it to unlock: profit margin trends, discount impact analysis, "
                "monthly P&L, loss-making sub-categories and more.")
     else:
-        hdr("Profitability Overview")
+        hdr("💹","Profitability Overview")
         c1,c2,c3 = st.columns(3)
 
         with c1:
-            cp = fdf.groupby("Category")["Profit"].sum().reset_index()
-            clr = ["#34d399" if v>0 else "#f87171" for v in cp["Profit"]]
-            fig = go.Figure(go.Bar(
-                x=cp["Category"], y=cp["Profit"], marker_color=clr,
-                text=[fmt(v,INR) for v in cp["Profit"]], textposition="outside",
-            ))
-            _apply(fig,"Profit by Category",295)
-            st.plotly_chart(fig, use_container_width=True)
+            cp = view.category_profit()
+            def category_profit():
+                clr = ["#34d399" if v>0 else "#f87171" for v in cp["Profit"]]
+                fig = go.Figure(go.Bar(
+                    x=cp["Category"], y=cp["Profit"], marker_color=clr,
+                    text=fmt_all(cp["Profit"], INR), textposition="outside",
+                ))
+                _apply(fig,"Profit by Category",295)
+                return fig
+            chart(category_profit, cp, money=True)
 
         with c2:
-            rpm = fdf.groupby("Region").agg(Sales=("Sales","sum"),Profit=("Profit","sum")).reset_index()
-            rpm["Margin"] = (rpm["Profit"]/rpm["Sales"]*100).round(2)
-            clr = ["#34d399" if v>10 else "#fbbf24" if v>0 else "#f87171" for v in rpm["Margin"]]
-            fig = go.Figure(go.Bar(
-                x=rpm["Region"], y=rpm["Margin"], marker_color=clr,
-                text=[f"{v:.1f}%" for v in rpm["Margin"]], textposition="outside",
-            ))
-            _apply(fig,"Margin % by Region",295)
-            fig.add_hline(y=0, line_color="rgba(255,255,255,0.2)", line_dash="dash")
-            st.plotly_chart(fig, use_container_width=True)
+            rpm = view.region_margin()
+            def region_margin():
+                clr = ["#34d399" if v>10 else "#fbbf24" if v>0 else "#f87171" for v in rpm["Margin"]]
+                fig = go.Figure(go.Bar(
+                    x=rpm["Region"], y=rpm["Margin"], marker_color=clr,
+                    text=[f"{v:.1f}%" for v in rpm["Margin"]], textposition="outside",
+                ))
+                _apply(fig,"Margin % by Region",295)
+                fig.add_hline(y=0, line_color="rgba(255,255,255,0.2)", line_dash="dash")
+                return fig
+            chart(region_margin, rpm)
 
         with c3:
-            fig = px.histogram(fdf, x="Profit", nbins=50,
-                               color_discrete_sequence=["#60a5fa"])
-            fig.update_traces(opacity=.78, marker_line_width=0)
-            fig.add_vline(x=0, line_color="#f87171", line_dash="dash", line_width=2)
-            fig.add_vline(x=fdf["Profit"].mean(), line_color="#34d399",
-                          line_dash="dot", line_width=2)
-            fig.update_layout(**_BG, height=295, title="Profit Distribution", bargap=.04)
-            fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-            st.plotly_chart(fig, use_container_width=True)
+            # binned server-side — ~50 bars reach the browser whatever the row count
+            ph, mean = view.profit_histogram(), view.profit_mean()
+            def profit_distribution():
+                fig = go.Figure(go.Bar(
+                    x=(ph["left"] + ph["right"]) / 2, y=ph["count"], width=ph["right"] - ph["left"],
+                    marker_color="#60a5fa", opacity=.78, marker_line_width=0,
+                    customdata=ph[["left","right"]],
+                    hovertemplate="%{customdata[0]:,.0f} – %{customdata[1]:,.0f}<br>%{y:,} rows<extra></extra>",
+                ))
+                fig.add_vline(x=0, line_color="#f87171", line_dash="dash", line_width=2)
+                if mean is not None:
+                    fig.add_vline(x=mean, line_color="#34d399", line_dash="dot", line_width=2)
+                fig.update_layout(**_BG, height=295, title="Profit Distribution", bargap=.04)
+                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                return fig
+            chart(profit_distribution, ph, mean)
 
         if HAS_DATE:
-            hdr("📈","Monthly Profit Trend")
-            _f2 = fdf.copy()
-            _f2["YM2"] = _f2["Order Date"].dt.to_period("M").dt.to_timestamp()
-            mp = _f2.groupby("YM2").agg(Profit=("Profit","sum"),Sales=("Sales","sum")).reset_index()
-            mp["Margin"] = (mp["Profit"]/mp["Sales"]*100).round(2)
-
-            fig = make_subplots(specs=[[{"secondary_y":True}]])
-            fig.add_trace(go.Bar(
-                x=mp["YM2"], y=mp["Profit"], name="Profit",
-                marker_color=[("#34d399" if v>0 else "#f87171") for v in mp["Profit"]],
-                opacity=.82,
-            ), secondary_y=False)
-            fig.add_trace(go.Scatter(
-                x=mp["YM2"], y=mp["Margin"], name="Margin %",
-                line=dict(color="#fbbf24",width=2),
-                mode="lines+markers", marker=dict(size=4),
-            ), secondary_y=True)
-            fig.update_layout(**_BG, height=355, title="Monthly Profit & Margin %")
-            fig.update_xaxes(**_XA)
-            fig.update_yaxes(title_text="Profit", gridcolor="rgba(255,255,255,0.04)",
-                             tickfont=dict(color="#475569",size=10), secondary_y=False)
-            fig.update_yaxes(title_text="Margin %", gridcolor="rgba(0,0,0,0)",
-                             tickfont=dict(color="#fbbf24",size=10), secondary_y=True)
-            fig.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash",
-                          secondary_y=False)
-            st.plotly_chart(fig, use_container_width=True)
+            hdr("📈","Profit Trend")
+            level, window = trend_controls("profit_trend")
+            mp = view.trend(level, window)
+
+            def profit_trend():
+                fig = make_subplots(specs=[[{"secondary_y":True}]])
+                fig.add_trace(go.Bar(
+                    x=mp["Period"], y=mp["Profit"], name="Profit",
+                    marker_color=[("#34d399" if v>0 else "#f87171") for v in mp["Profit"]],
+                    opacity=.82,
+                ), secondary_y=False)
+                fig.add_trace(go.Scatter(
+                    x=mp["Period"], y=mp["Margin"], name="Margin %",
+                    line=dict(color="#fbbf24",width=2),
+                    mode="lines+markers", marker=dict(size=4),
+                ), secondary_y=True)
+                fig.update_layout(**_BG, height=355, title=f"{pyramid.LEVELS[level]} Profit & Margin %")
+                fig.update_xaxes(**_XA)
+                fig.update_yaxes(title_text="Profit", gridcolor="rgba(255,255,255,0.04)",
+                                 tickfont=dict(color="#475569",size=10), secondary_y=False)
+                fig.update_yaxes(title_text="Margin %", gridcolor="rgba(0,0,0,0)",
+                                 tickfont=dict(color="#fbbf24",size=10), secondary_y=True)
+                fig.add_hline(y=0, line_color="rgba(255,255,255,0.15)", line_dash="dash",
+                              secondary_y=False)
+                return fig
+            chart(profit_trend, level, mp, key="profit_trend", selection_mode=("points", "box"),
+                  on_select=lambda: drill("profit_trend", level))
         else:
             nodata("Order Date","Add an <b>Order Date</b> column to see monthly P&L trends.")
 
@@ -848,43 +1016,57 @@ with tab4:
             hdr("🎟️","Discount Impact on Profit")
             c1,c2 = st.columns(2)
             with c1:
-                samp = fdf.sample(min(3000,len(fdf)),random_state=42)
-                fig = px.scatter(samp, x="Discount", y="Profit", color="Category",
-                                 color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"],
-                                 opacity=.5)
-                fig.add_hline(y=0, line_color="#f87171", line_dash="dash")
-                fig.update_layout(**_BG, height=310, title="Discount vs Profit (sample)")
-                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-                st.plotly_chart(fig, use_container_width=True)
+                mode = st.radio("View", ["Density (all rows)", "Points (3k sample)"],
+                                horizontal=True, label_visibility="collapsed", key="disc_view")
+                density = mode.startswith("Density")
+                dd = view.discount_density() if density else view.discount_sample()
+                def discount_profit():
+                    if density:
+                        fig = go.Figure(go.Heatmap(
+                            x=dd.columns, y=dd.index, z=np.log1p(dd.to_numpy()), customdata=dd.to_numpy(),
+                            colorscale=["#0f172a","#1e3a5f","#60a5fa","#fbbf24"], showscale=False,
+                            hovertemplate="Discount %{x:.2f}<br>Profit %{y:,.0f}<br>%{customdata:,} rows<extra></extra>",
+                        ))
+                        title = "Discount vs Profit (row density)"
+                    else:
+                        fig = px.scatter(dd, x="Discount", y="Profit", color="Category",
+                                         color_discrete_sequence=["#60a5fa","#fbbf24","#34d399"],
+                                         opacity=.5, render_mode="webgl")
+                        title = "Discount vs Profit (sample)"
+                    fig.add_hline(y=0, line_color="#f87171", line_dash="dash")
+                    fig.update_layout(**_BG, height=310, title=title)
+                    fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                    return fig
+                chart(discount_profit, density, dd)
             with c2:
-                bins = pd.cut(fdf["Discount"],
-                              bins=[0,.1,.2,.3,.5,1.0],
-                              labels=["0-10%","10-20%","20-30%","30-50%","50%+"],
-                              include_lowest=True)
-                dp = fdf.groupby(bins,observed=True)["Profit"].mean().reset_index()
-                dp.columns=["Disc Range","Avg Profit"]
-                fig = px.bar(dp, x="Disc Range", y="Avg Profit", color="Avg Profit",
-                             color_continuous_scale=["#f87171","#fbbf24","#34d399"])
-                fig.add_hline(y=0, line_color="rgba(255,255,255,0.2)", line_dash="dash")
-                fig.update_layout(**_BG, height=310, title="Avg Profit by Discount Band",
-                                  showlegend=False, coloraxis_showscale=False)
-                fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
-                st.plotly_chart(fig, use_container_width=True)
+                dp = view.discount_bands()
+                def discount_bands():
+                    fig = px.bar(dp, x="Disc Range", y="Avg Profit", color="Avg Profit",
+                                 color_continuous_scale=["#f87171","#fbbf24","#34d399"])
+                    fig.add_hline(y=0, line_color="rgba(255,255,255,0.2)", line_dash="dash")
+                    fig.update_layout(**_BG, height=310, title="Avg Profit by Discount Band",
+                                      showlegend=False, coloraxis_showscale=False)
+                    fig.update_xaxes(**_XA); fig.update_yaxes(**_YA)
+                    return fig
+                chart(discount_bands, dp)
         else:
             nodata("Discount","Add a <b>Discount</b> column to see how discount bands affect profitability.")
 
 
 #DATA EXPLORER
 
-with tab5:
-    hdr("📋","Raw Data Explorer", f"{len(fdf):,} rows")
+def tab_data_explorer():
+    rows = view.positions()
+    hdr("📋","Raw Data Explorer", f"{len(rows):,} sampled rows" if streaming else f"{len(rows):,} rows")
 
     c1,c2,c3,c4 = st.columns(4)
     for col, lbl, val, sub in [
-        (c1,"Total Rows",   f"{len(fdf):,}",                          "after filters"),
-        (c2,"Columns",      f"{fdf.shape[1]}",                        "in dataset"),
-        (c3,"Memory",       f"{fdf.memory_usage(deep=True).sum()/1024:.0f} KB", "loaded"),
-        (c4,"Null Values",  f"{fdf.isnull().sum().sum():,}",           "across all columns"),
+        (c1,"Total Rows",   f"{len(rows):,}",                         "after filters"),
+        (c2,"Columns",      f"{df.shape[1]}",                         "in dataset"),
+        (c3,"Memory",       fmt_bytes(mem["bytes"]),
+                            f"cube + sample · {fmt_bytes(mem['raw_bytes'])} file" if streaming
+                            else f"loaded · {fmt_bytes(mem['raw_bytes'])} before typing"),
+        (c4,"Null Values",  f"{int(view.stats['Nulls'].sum()):,}",  "across all columns"),
     ]:
         col.markdown(f"""
         <div class="icard">
@@ -896,21 +1078,97 @@ with tab5:
     st.markdown("<div style='height:.6rem'></div>", unsafe_allow_html=True)
 
     show = st.multiselect("Select columns to display",
-                          fdf.columns.tolist(), default=fdf.columns.tolist()[:8])
+                          df.columns.tolist(), default=df.columns.tolist()[:8])
     if show:
-        st.dataframe(fdf[show].reset_index(drop=True), use_container_width=True, height=400)
+        # search, sort and paging run on row positions — only the visible page is built
+        c1,c2,c3,c4 = st.columns([3,2,1,1])
+        search  = c1.text_input("🔍 Search", placeholder="text in any displayed column")
+        sort_by = c2.selectbox("Sort by", ["—"] + show)
+        desc    = c3.toggle("Descending")
+        size    = c4.selectbox("Rows / page", grid.PAGE_SIZES, index=1)
+        sort_by = None if sort_by == "—" else sort_by
+        hits = cached(("grid", search, tuple(show) if search else (), sort_by, desc),
+                      lambda: grid.select_rows(df, rows, search, show, sort_by, desc))
+        pages = max(1, -(-len(hits) // size))
+        pg = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1)
+        st.dataframe(grid.page(df, hits, show, pg - 1, size), use_container_width=True, height=400)
+        st.caption(f"Rows {(pg-1)*size+1:,}–{min(pg*size, len(hits)):,} of {len(hits):,}"
+                   if len(hits) else "No rows match the search.")
 
     hdr("⬇️","Export Filtered Data")
-    st.download_button(
-        label=f"⬇️  Download filtered CSV  ({len(fdf):,} rows)",
-        data=fdf.to_csv(index=False).encode("utf-8"),
-        file_name="superstore_filtered.csv",
-        mime="text/csv",
+    c1,c2 = st.columns([1,3])
+    fmt_name = c1.selectbox("Format", list(FORMATS), label_visibility="collapsed")
+    ext, mime = FORMATS[fmt_name]
+    # callable data → serialized only when clicked, on Streamlit's download thread
+    c2.download_button(
+        label=f"⬇️  Download filtered {fmt_name}  ({len(rows):,} rows)",
+        data=lambda v=view, f=fmt_name: export(v.rows, f),
+        file_name=f"superstore_filtered{ext}",
+        mime=mime,
     )
 
-    hdr("📐","Statistical Summary")
-    num_cols = fdf.select_dtypes(include=np.number).columns.tolist()
-    if num_cols:
-        st.dataframe(fdf[num_cols].describe().round(2), use_container_width=True)
+    hdr("📐","Statistical Summary", "quartiles approx.")
+    if ds.shift:
+        st.dataframe(view.describe(), use_container_width=True)
     else:
-        nodata("numeric columns","No numeric columns detected for summary statistics.")
\ No newline at end of file
+        nodata("numeric columns","No numeric columns detected for summary statistics.")
+
+    with st.expander("Column profile (whole dataset)"):
+        st.dataframe(ds.columns.assign(memory=ds.columns["memory"].map(fmt_bytes)),
+                     use_container_width=True)
+
+for tab, render in zip(tabs, [tab_sales_trends, tab_regional, tab_products,
+                              tab_profitability, tab_data_explorer]):
+    if tab.open:
+        with tab, trace.stage(f"tab: {render.__name__[4:]}"):
+            render()
+
+# after the first render of an upload: warm the cache for the likely first clicks
+# (all selected, each single Region / Category) — once per dataset + engine
+@st.cache_resource(show_spinner=False)
+def warm_up(digest, streaming, backend, _source, _states):
+    key = functools.partial(signature, digest, streaming, backend)
+    return warmup.Warmup(_source, agg_cache(), key, _states).start()
+
+warm = None
+if uploaded is not None:
+    warm = warm_up(digest, streaming, backend, source,
+                   warmup.states(ds, (dmin, dmax) if date_range is not None else None))
+
+with st.sidebar.expander("🛠️ Admin — memory & caches"):
+    budget = memory_budget()
+    used = budget.used()
+    st.progress(min(used / budget.max_bytes, 1.0),
+                text=f"{fmt_bytes(used)} of {fmt_bytes(budget.max_bytes)} budget")
+    st.dataframe(pd.DataFrame([c.stats() for c in budget.caches])
+                 .assign(bytes=lambda t: t["bytes"].map(fmt_bytes))
+                 [["name", "entries", "bytes", "hit_rate", "evicted_lru", "evicted_ttl", "evicted_budget"]],
+                 hide_index=True)
+    if budget.oversized:
+        st.caption(f"⚠️ {budget.oversized} entries larger than the whole budget were kept while in use "
+                   "— raise SUPERSTORE_MEMORY_BUDGET")
+    st.caption("Shared datasets (one copy per process, every session)")
+    st.dataframe(pd.DataFrame(datasets().entries(), columns=["key", "rows", "bytes", "sessions"])
+                 .assign(bytes=lambda t: t["bytes"].map(fmt_bytes)), hide_index=True)
+    st.caption("Figure cache per chart")
+    st.dataframe(pd.DataFrame(figure_cache().chart_stats(), columns=["chart", "hits", "misses", "hit_rate"]),
+                 hide_index=True)
+    if warm:
+        st.caption("Background warm-up")
+        st.json(warm.status())
+
+# ─── Performance panel — this rerun's stages + this session's reruns ──
+trace.write()
+runs = st.session_state.setdefault("perf_history", [])
+runs.append({"run": trace.run, "ms": trace.total_ms()})
+del runs[:-PERF_HISTORY]
+with st.sidebar.expander("⏱️ Performance"):
+    st.caption(f"Rerun #{trace.run} · {trace.total_ms():,.0f} ms · session {trace.session}")
+    st.dataframe(pd.DataFrame([
+        {"stage": "· " * r["depth"] + r["stage"], "ms": r["ms"],
+         "Δ RSS (MB)": None if r["rss_delta"] is None else r["rss_delta"] / 1024**2,
+         "cache": r.get("cache", "")}
+        for r in trace.rows()]).round(2), hide_index=True, use_container_width=True)
+    st.bar_chart(pd.DataFrame(runs).set_index("run")["ms"], height=140)
+    if perf.LOG_PATH:
+        st.caption(f"Logging to `{perf.LOG_PATH}`")
\ No newline at end of file
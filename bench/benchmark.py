@@ -0,0 +1,146 @@
+"""Time and memory-profile each dashboard stage on a CSV.
+
+    python -m bench.benchmark data/superstore_1m.csv --out results/1m.json
+    python -m bench.benchmark data/superstore_1m.csv --compare results/1m.json
+
+Stages mirror what app.py runs: ingest, the cube and engine.Dataset (profile
++ filter indexes) built per dataset, the filtered view, the KPI row, each
+tab's tables (engine.TABS) and the export. `--compare` prints the change per stage against an earlier
+report and exits non-zero when any stage got slower than `--tolerance`.
+"""
+import argparse
+import datetime as dt
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from superstore import cube as cubes, engine, ingest
+from superstore.export import FORMATS, export
+
+
+def measure(fn, repeat):
+    """Run `fn` → (result, best of `repeat` untraced seconds, peak MB of one traced run).
+
+    tracemalloc slows allocation-heavy code several-fold, so timing and memory
+    come from separate runs.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak / 1024**2
+
+
+def _scenario(ds):
+    """A typical sidebar state: two regions, a date range cutting through months."""
+    dmin, dmax = ds.df["Order Date"].min(), ds.df["Order Date"].max()
+    span = dmax - dmin
+    dates = ((dmin + span * 0.25).date(), (dmin + span * 0.9).date())
+    return dates, {"Region": ds.options("Region")[:2]}
+
+
+def _fresh(base):
+    """A new view of base's filters that reuses its filtered cube and profile."""
+    tables = {"fcube": base.cube, "fstats": base.stats}
+    view = base.ds.view(base.date_range, base.selections, memo=lambda name, compute:
+                        tables[name] if name in tables else tables.setdefault(name, compute()))
+    return view
+
+
+def _tab(base, names):
+    view = _fresh(base)
+    return [getattr(view, n)() for n in names if n not in engine.CHARTS
+            or view.ds.has(*engine.CHARTS[n])]
+
+
+def _drain(f):
+    while f.read(1 << 22):
+        pass
+
+
+def run(path, repeat=3):
+    stages = {}
+
+    def stage(name, fn):
+        result, seconds, peak = measure(fn, repeat)
+        stages[name] = {"seconds": round(seconds, 6), "peak_mb": round(peak, 2)}
+        print(f"  {name:<28} {seconds * 1000:>10.1f} ms {peak:>10.1f} MB", file=sys.stderr)
+        return result
+
+    df, mem = stage("ingest", lambda: ingest.read_csv(path))
+    cube = stage("cube", lambda: cubes.aggregate(df))
+    ds = stage("dataset", lambda: engine.Dataset(df, cube, mem))
+
+    dates, selections = _scenario(ds)
+    view = stage("filters", lambda: ds.view(dates, selections))
+    rows = stage("filtered_rows", lambda: ds.view(dates, selections).rows)
+    stage("filtered_cube", lambda: ds.view(dates, selections).cube)
+    stage("filtered_profile", lambda: ds.view(dates, selections).stats)
+    view.cube, view.stats  # tab stages time the tables only, as on a warm rerun
+    stage("kpis", lambda: _fresh(view).kpis())
+    for tab, names in engine.TABS.items():
+        stage(f"tab:{tab}", lambda names=names: _tab(view, names))
+    for fmt in FORMATS:
+        stage(f"export:{fmt}", lambda fmt=fmt: _drain(export(rows, fmt)))
+
+    return {
+        "meta": {"file": str(path), "rows": len(df), "filtered_rows": len(rows),
+                 "cube_cells": len(cube), "repeat": repeat,
+                 "python": platform.python_version(), "pandas": pd.__version__,
+                 "numpy": np.__version__, "machine": platform.machine(),
+                 "created": dt.datetime.now().isoformat(timespec="seconds")},
+        "stages": stages,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print per-stage deltas; return the stages slower than baseline × (1 + tolerance)."""
+    slower = []
+    print(f"{'stage':<28} {'base ms':>10} {'now ms':>10} {'change':>8}")
+    for name, now in report["stages"].items():
+        base = baseline["stages"].get(name)
+        if base is None:
+            print(f"{name:<28} {'—':>10} {now['seconds'] * 1000:>10.1f} {'new':>8}")
+            continue
+        ratio = now["seconds"] / base["seconds"] if base["seconds"] else float("inf")
+        flag = " ✗" if ratio > 1 + tolerance else ""
+        print(f"{name:<28} {base['seconds'] * 1000:>10.1f} {now['seconds'] * 1000:>10.1f} "
+              f"{ratio - 1:>+8.0%}{flag}")
+        if flag:
+            slower.append(name)
+    return slower
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("csv")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--out", help="write the JSON report here")
+    ap.add_argument("--compare", help="earlier JSON report to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.2,
+                    help="allowed slowdown per stage before --compare fails (default 0.2 = 20%%)")
+    args = ap.parse_args(argv)
+
+    report = run(args.csv, args.repeat)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(report, json.load(f), args.tolerance)
+        if slower:
+            sys.exit(f"slower than baseline: {', '.join(slower)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Generate a Superstore-shaped CSV of any size.
+
+    python -m bench.generate --rows 1000000 --out data/superstore_1m.csv
+
+Rows are written in chunks, so 50M-row files need no more memory than 10k.
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+REGIONS = {
+    "East":    ["New York", "Pennsylvania", "Ohio", "Massachusetts", "New Jersey", "Connecticut",
+                "Delaware", "Maryland", "Rhode Island", "New Hampshire", "Vermont", "Maine",
+                "West Virginia", "District of Columbia"],
+    "West":    ["California", "Washington", "Arizona", "Colorado", "Oregon", "Utah", "Nevada",
+                "New Mexico", "Idaho", "Montana", "Wyoming"],
+    "Central": ["Texas", "Illinois", "Michigan", "Indiana", "Wisconsin", "Minnesota", "Missouri",
+                "Oklahoma", "Nebraska", "Iowa", "Kansas", "South Dakota", "North Dakota"],
+    "South":   ["Florida", "North Carolina", "Virginia", "Georgia", "Tennessee", "Kentucky",
+                "Alabama", "Mississippi", "South Carolina", "Louisiana", "Arkansas"],
+}
+REGION_WEIGHTS = [0.28, 0.32, 0.23, 0.17]
+CATEGORIES = {
+    "Furniture":       ["Bookcases", "Chairs", "Furnishings", "Tables"],
+    "Office Supplies": ["Appliances", "Art", "Binders", "Envelopes", "Fasteners", "Labels",
+                        "Paper", "Storage", "Supplies"],
+    "Technology":      ["Accessories", "Copiers", "Machines", "Phones"],
+}
+CATEGORY_WEIGHTS = [0.21, 0.60, 0.19]
+# typical unit price per sub-category (log-normal around it)
+PRICE = {"Bookcases": 250, "Chairs": 180, "Furnishings": 35, "Tables": 320, "Appliances": 110,
+         "Art": 15, "Binders": 25, "Envelopes": 30, "Fasteners": 7, "Labels": 7, "Paper": 20,
+         "Storage": 110, "Supplies": 25, "Accessories": 55, "Copiers": 700, "Machines": 400,
+         "Phones": 120}
+SEGMENTS, SEGMENT_WEIGHTS = ["Consumer", "Corporate", "Home Office"], [0.52, 0.30, 0.18]
+SHIP_MODES = ["Standard Class", "Second Class", "First Class", "Same Day"]
+SHIP_WEIGHTS, SHIP_DAYS = [0.60, 0.19, 0.16, 0.05], [(4, 8), (2, 6), (1, 4), (0, 1)]
+DISCOUNTS = np.array([0, 0.1, 0.15, 0.2, 0.3, 0.4, 0.45, 0.5, 0.6, 0.7, 0.8])
+DISCOUNT_WEIGHTS = [0.48, 0.02, 0.01, 0.37, 0.02, 0.02, 0.005, 0.015, 0.005, 0.04, 0.02]
+PRODUCTS_PER_SUBCAT = 110
+CUSTOMERS = 800
+
+
+def _draw(rng, weights, n):
+    weights = np.asarray(weights, dtype=float)
+    return rng.choice(len(weights), n, p=weights / weights.sum())
+
+
+def _pick(rng, options, weights, n):
+    return np.asarray(options, dtype=object)[_draw(rng, weights, n)]
+
+
+def chunk(rng, n, start, days, first_id):
+    """`n` synthetic order lines with ids from `first_id`."""
+    region = _draw(rng, REGION_WEIGHTS, n)
+    regions = np.array(list(REGIONS), dtype=object)[region]
+    states = np.empty(n, dtype=object)
+    for i, name in enumerate(REGIONS):
+        hit = region == i
+        states[hit] = _pick(rng, REGIONS[name], np.linspace(2, 1, len(REGIONS[name])), hit.sum())
+
+    cat = _draw(rng, CATEGORY_WEIGHTS, n)
+    subcats = np.empty(n, dtype=object)
+    for i, name in enumerate(CATEGORIES):
+        hit = cat == i
+        subcats[hit] = _pick(rng, CATEGORIES[name], np.ones(len(CATEGORIES[name])), hit.sum())
+    product_no = rng.zipf(1.6, n) % PRODUCTS_PER_SUBCAT
+    products = pd.Series(subcats).str.cat(pd.Series(product_no).astype(str), sep=" Model ")
+
+    # business grows over the years → more orders toward the end of the range
+    order = start + pd.to_timedelta((rng.beta(1.3, 1, n) * days).astype(int), unit="D")
+    ship_mode = _draw(rng, SHIP_WEIGHTS, n)
+    lo, hi = np.array(SHIP_DAYS).T
+    ship = order + pd.to_timedelta(rng.integers(lo[ship_mode], hi[ship_mode] + 1), unit="D")
+
+    qty = 1 + rng.poisson(2.8, n)
+    discount = DISCOUNTS[_draw(rng, DISCOUNT_WEIGHTS, n)]
+    price = pd.Series(subcats).map(PRICE).to_numpy(float) * rng.lognormal(0, 0.7, n)
+    sales = (price * qty * (1 - discount)).round(4)
+    margin = rng.normal(0.17, 0.12, n) - 1.4 * np.maximum(discount - 0.15, 0)
+    profit = (sales * margin).round(4)
+
+    cust = rng.integers(0, CUSTOMERS, n)
+    initials = np.array([f"{chr(65 + i % 26)}{chr(65 + i * 7 % 26)}" for i in range(CUSTOMERS)])
+    row_id = np.arange(first_id, first_id + n)
+    order_id = "US-" + pd.Series(order.year).astype(str) + "-" + pd.Series(100000 + row_id // 3).astype(str)
+    return pd.DataFrame({
+        "Row ID":       row_id,
+        "Order ID":     order_id,
+        "Order Date":   order.strftime("%d/%m/%Y"),
+        "Ship Date":    ship.strftime("%d/%m/%Y"),
+        "Ship Mode":    np.asarray(SHIP_MODES, dtype=object)[ship_mode],
+        "Customer ID":  pd.Series(initials[cust]).str.cat(pd.Series(10000 + cust * 13).astype(str), sep="-"),
+        "Segment":      _pick(rng, SEGMENTS, SEGMENT_WEIGHTS, n),
+        "Country":      "United States",
+        "State":        states,
+        "Region":       regions,
+        "Category":     np.array(list(CATEGORIES), dtype=object)[cat],
+        "Sub-Category": subcats,
+        "Product Name": products,
+        "Sales":        sales,
+        "Quantity":     qty,
+        "Discount":     discount,
+        "Profit":       profit,
+    })
+
+
+def generate(path, rows, seed=0, start="2014-01-01", years=4, chunk_rows=500_000):
+    rng = np.random.default_rng(seed)
+    start, days = pd.Timestamp(start), int(365.25 * years)
+    for first in range(0, rows, chunk_rows):
+        part = chunk(rng, min(chunk_rows, rows - first), start, days, first + 1)
+        part.to_csv(path, mode="w" if first == 0 else "a", header=first == 0, index=False)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=10_000)
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--start", default="2014-01-01")
+    ap.add_argument("--years", type=int, default=4)
+    args = ap.parse_args(argv)
+    generate(args.out, args.rows, args.seed, args.start, args.years)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Data layer behind the Superstore Analytics dashboard (app.py)."""
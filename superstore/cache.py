@@ -0,0 +1,206 @@
+"""Memory-budgeted LRU caches with hit/miss/eviction counters.
+
+Every entry is charged its real size (`sizeof`). A cache bounds its own entry
+count, entries unused for `ttl` seconds expire, and caches sharing a `Budget`
+are held under one global byte limit: past it, the least recently used entry
+across all of them is evicted first. The entry being stored and each cache's
+most recently used entry (the one in use) are never evicted for the budget,
+so a single entry larger than the budget stays — with a logged warning —
+instead of being dropped and recomputed on every use.
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_bytes(text):
+    """"512MB", "4 GB", "1.5G" or a plain byte count → bytes."""
+    m = re.fullmatch(r"([\d.]+)\s*([KMGT]?)I?B?", str(text).strip().upper())
+    if not m:
+        raise ValueError(f"not a byte size: {text!r}")
+    return int(float(m[1]) * _UNITS[m[2]])
+
+
+# shared by the dataset registry and the aggregation cache of a server process
+MEMORY_BUDGET = parse_bytes(os.environ.get("SUPERSTORE_MEMORY_BUDGET") or "2GB")
+# seconds an entry may go unused before it expires (0: never)
+TTL = float(os.environ.get("SUPERSTORE_CACHE_TTL") or 6 * 3600) or None
+
+
+def sizeof(value):
+    """Resident bytes of a cached value — frames deep, arrays, containers recursively.
+
+    Objects holding their own data (datasets) report it as an `nbytes` attribute.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Index)):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k) + sizeof(v) for k, v in value.items())
+    if isinstance(value, (str, bytes, int, float, type(None))) or np.isscalar(value):
+        return sys.getsizeof(value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+class Budget:
+    """A byte limit shared by several caches."""
+
+    def __init__(self, max_bytes=MEMORY_BUDGET):
+        self.max_bytes = max_bytes
+        self.caches = []
+        self.oversized = 0  # entries stored while larger than the whole budget
+        self._lock = threading.Lock()
+
+    def add(self, cache):
+        cache.budget = self
+        self.caches.append(cache)
+        return cache
+
+    def used(self):
+        return sum(c.bytes for c in self.caches)
+
+    def enforce(self, keep=None):
+        """Expire idle entries, then evict the globally least recently used until under budget.
+
+        `keep` is the (cache, key) of the entry being stored, which is never evicted.
+        """
+        with self._lock:
+            for c in self.caches:
+                c.expire()
+            while self.used() > self.max_bytes:
+                lru = [(c.evictable(keep[1] if keep and keep[0] is c else _MISS), c)
+                       for c in self.caches]
+                lru = [(entry, c) for entry, c in lru if entry is not None]
+                if not lru:
+                    break  # only entries in use left
+                (_, key), c = min(lru, key=lambda t: t[0][0])
+                c.evict(key, "budget")
+
+    def stats(self):
+        return {"max_bytes": self.max_bytes, "used_bytes": self.used(), "oversized": self.oversized,
+                "caches": [c.stats() for c in self.caches]}
+
+
+_MISS = object()
+
+
+class LRUCache:
+    """Thread-safe LRU map; `get(key, compute)` memoizes `compute()` under `key`.
+
+    Values are shared between callers — treat them as read-only.
+    """
+
+    def __init__(self, maxsize=512, ttl=None, name="cache"):
+        self.maxsize, self.ttl, self.name = maxsize, ttl, name
+        self.budget = None
+        self._data = OrderedDict()  # key → [value, bytes, last used]
+        self._lock = threading.Lock()
+        self.bytes = self.hits = self.misses = 0
+        self.evicted = {"lru": 0, "ttl": 0, "budget": 0}
+
+    @property
+    def evictions(self):
+        return sum(self.evicted.values())
+
+    def _lookup(self, key, count=True):
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl and now - entry[2] > self.ttl:
+                self._drop(key, "ttl")
+                entry = None
+            if entry is None:
+                self.misses += count
+                return _MISS
+            self._data.move_to_end(key)
+            entry[2] = now
+            self.hits += count
+            return entry[0]
+
+    def get(self, key, compute):
+        value = self._lookup(key)
+        if value is _MISS:
+            value = compute()  # outside the lock — a concurrent miss just computes twice
+            self.put(key, value)
+        return value
+
+    def sizeof(self, value):
+        """Bytes to charge `value` — `sizeof` unless a subclass knows better."""
+        return sizeof(value)
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = [value, size, time.time()]
+            self.bytes += size
+            while len(self._data) > self.maxsize:
+                self._drop(next(iter(self._data)), "lru")
+        if self.budget:
+            if size > self.budget.max_bytes:
+                self.budget.oversized += 1
+                log.warning("%s: entry %.80r of %d bytes exceeds the %d-byte memory budget; "
+                            "kept while in use", self.name, key, size, self.budget.max_bytes)
+            self.budget.enforce(keep=(self, key))
+        else:
+            self.expire()
+
+    def _drop(self, key, reason=None):
+        self.bytes -= self._data.pop(key)[1]
+        if reason:
+            self.evicted[reason] += 1
+
+    def expire(self):
+        if not self.ttl:
+            return
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key in [k for k, e in self._data.items() if e[2] < cutoff]:
+                self._drop(key, "ttl")
+
+    def evictable(self, keep=_MISS):
+        """(last use, key) of the least recently used entry other than `keep` and the
+        most recently used one (in use), or None."""
+        with self._lock:
+            last = len(self._data) - 1
+            for i, (key, entry) in enumerate(self._data.items()):
+                if i == last:
+                    return None
+                if key != keep:
+                    return entry[2], key
+            return None
+
+    def evict(self, key, reason="lru"):
+        with self._lock:
+            if key in self._data:
+                self._drop(key, reason)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"name": self.name, "entries": len(self._data), "max_entries": self.maxsize,
+                    "bytes": self.bytes, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, **{f"evicted_{k}": v for k, v in self.evicted.items()},
+                    "hit_rate": round(self.hits / total, 3) if total else 0.0}
@@ -0,0 +1,129 @@
+"""Additive Sales/Profit/Quantity/Orders aggregates at the dashboard grain."""
+import numpy as np
+import pandas as pd
+
+from . import kernel, profiling, pyramid
+from .ingest import CHUNK_ROWS, compact, iter_csv, memory_bytes, month
+
+# month + weekday derived from Order Date, then every filter / chart dimension
+DIMS = ["Region", "Category", "Sub-Category", "State", "Segment", "Ship Mode"]
+MEASURES = ["Sales", "Profit", "Quantity"]
+# row counts per cell: all rows, and rows with a Sales / Profit value (for means)
+COUNTS = ["Orders", "Sales Count", "Profit Count"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# uniform row sample kept by stream() for the row-level views
+SAMPLE_ROWS = 200_000
+
+
+def _keys(rows):
+    keys = []
+    if "Order Date" in rows.columns:
+        d = rows["Order Date"]
+        keys.append(month(rows))
+        codes = d.dt.dayofweek.fillna(-1).astype("int8").to_numpy()
+        keys.append(pd.Series(pd.Categorical.from_codes(codes, DAYS),
+                              index=rows.index, name="DayOfWeek"))
+    return keys + [rows[c] for c in DIMS if c in rows.columns]
+
+
+def aggregate(rows):
+    """Row-level frame → one row per grain cell with measure sums + row counts (COUNTS)."""
+    keys = _keys(rows)
+    vals = rows[[m for m in MEASURES if m in rows.columns]]
+    vals = vals.astype({m: "float64" for m in vals.columns if vals[m].dtype == "float32"})
+    g = vals.groupby(keys, observed=True, dropna=False, sort=False)
+    out = g.sum()
+    out["Orders"] = g.size()
+    if "Sales" in vals.columns:
+        out["Sales Count"] = g["Sales"].count()
+    if "Profit" in vals.columns:
+        out["Profit Count"] = g["Profit"].count()
+    return out.reset_index()
+
+
+def dims(cube):
+    return [c for c in cube.columns if c not in MEASURES and c not in COUNTS]
+
+
+def merge(parts):
+    """Combine partial cubes (e.g. one per chunk) into one."""
+    parts = [p for p in parts if p is not None]
+    if len(parts) == 1:
+        return parts[0]
+    both = pd.concat(parts, ignore_index=True)
+    return both.groupby(dims(both), observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def rollup(cube, by, measures):
+    """Sum `measures` over the `by` dimension(s) of a cube."""
+    return kernel.group(cube, by, measures)
+
+
+def _sample(rows, k, rng, prior=None):
+    """Bottom-k by random key — a uniform sample that merges across chunks."""
+    keyed = rows.assign(_key=rng.random(len(rows)))
+    if prior is not None:
+        keyed = pd.concat([prior, keyed], ignore_index=True)
+    return keyed.nsmallest(k, "_key") if len(keyed) > k else keyed
+
+
+def stream(f, chunksize=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, on_progress=None):
+    """Read a CSV chunk by chunk → (row sample, cube, info).
+
+    `info` also carries the merged profiling partition stats ("stats",
+    "shift") so the Data Explorer summary stays exact for the whole file,
+    and the time pyramid's day table ("days") so trends stay exact to the day.
+
+    Peak memory is bounded by `chunksize` + `sample_rows` + the cube, never
+    by file size. `on_progress(fraction, rows_read)` is called per chunk.
+    """
+    f.seek(0, 2)
+    size = max(f.tell(), 1)
+    f.seek(0)
+    rng = np.random.default_rng(0)
+    cube = sample = stats = shift = days = None
+    n, lo, hi = 0, [], []
+    for chunk in iter_csv(f, chunksize):
+        n += len(chunk)
+        cube = merge([cube, aggregate(chunk)])
+        sample = _sample(chunk, sample_rows, rng, sample)
+        shift = shift or profiling.shifts(chunk)
+        stats = profiling.merge([stats, profiling.partition_stats(chunk, shift)])
+        if "Order Date" in chunk.columns:
+            days = pyramid.merge([days, pyramid.days(chunk)])
+            lo.append(chunk["Order Date"].min())
+            hi.append(chunk["Order Date"].max())
+        if on_progress:
+            on_progress(min(f.tell() / size, 1.0), n)
+    sample = compact(sample.drop(columns="_key").reset_index(drop=True))
+    cube = compact(cube)
+    days = days if days is None else compact(days)
+    info = {
+        "rows": n,
+        "stats": stats,
+        "shift": shift,
+        "days": days,
+        "date_min": pd.Series(lo).min(),
+        "date_max": pd.Series(hi).max(),
+        "bytes": memory_bytes(sample) + memory_bytes(cube),
+        "raw_bytes": size,
+    }
+    return sample, cube, info
+
+
+def month_split(start, end):
+    """Split an inclusive date range into whole months and partial-month edges.
+
+    Returns (whole, edges): `whole` is an inclusive (first, last) date pair
+    covering complete months only — answerable from the monthly cube — or
+    None; `edges` are the leftover inclusive day ranges, which need rows.
+    """
+    start, stop = pd.Timestamp(start), pd.Timestamp(end) + pd.Timedelta(days=1)
+    m0 = start if start.is_month_start else start + pd.offsets.MonthBegin(1)
+    m1 = stop if stop.is_month_start else stop - pd.offsets.MonthBegin(1)
+    if m0 >= m1:
+        return None, [(start.date(), end)]
+    day = pd.Timedelta(days=1)
+    edges = [(a.date(), (b - day).date()) for a, b in [(start, m0), (m1, stop)] if a < b]
+    return (m0.date(), (m1 - day).date()), edges
@@ -0,0 +1,61 @@
+"""Currency as presentation — aggregates stay in USD, only their labels change.
+
+`rate` is the INR per USD to show rupees with, None for dollars. `labels`
+formats a whole column at once: the unit (Cr / L / M / K) and scaled value
+of every element are picked with array operations, leaving one string
+format per label.
+"""
+import numpy as np
+
+# unit thresholds, largest first, and the format of each unit (the last: below them all)
+_UNITS = {
+    "INR": ([1_00_00_000, 1_00_000], ["₹{:.2f} Cr", "₹{:.2f} L", "₹{:,.0f}"]),
+    "USD": ([1_000_000, 1_000], ["${:.2f}M", "${:.1f}K", "${:,.2f}"]),
+}
+
+
+def fmt(val, rate=None):
+    """Compact currency string — complete, never truncated."""
+    if rate is not None:
+        v = val * rate
+        if v >= 1_00_00_000: return f"₹{v/1_00_00_000:.2f} Cr"
+        if v >= 1_00_000:    return f"₹{v/1_00_000:.2f} L"
+        return f"₹{v:,.0f}"
+    if val >= 1_000_000: return f"${val/1_000_000:.2f}M"
+    if val >= 1_000:     return f"${val/1_000:.1f}K"
+    return f"${val:,.2f}"
+
+
+def fmt_words(val, rate=None):
+    """Full value in words — shown below the compact number."""
+    if rate is not None:
+        v = val * rate
+        if v >= 1_00_00_000:
+            cr  = int(v // 1_00_00_000)
+            lkh = int((v % 1_00_00_000) // 1_00_000)
+            return f"{cr} Crore {lkh} Lakh" if lkh else f"{cr} Crore"
+        if v >= 1_00_000:
+            lkh = int(v // 1_00_000)
+            th  = int((v % 1_00_000) // 1_000)
+            return f"{lkh} Lakh {th} Thousand" if th else f"{lkh} Lakh"
+        return f"₹{v:,.0f}"
+    # USD words
+    if val >= 1_000_000:
+        m = int(val // 1_000_000)
+        k = int((val % 1_000_000) // 1_000)
+        return f"{m} Million {k} Thousand" if k else f"{m} Million"
+    if val >= 1_000:
+        return f"{int(val):,}"
+    return ""
+
+
+def labels(values, rate=None):
+    """`fmt` of every value of an array at once → list of str."""
+    v = np.asarray(values, dtype="float64")
+    thresholds, formats = _UNITS["USD" if rate is None else "INR"]
+    if rate is not None:
+        v = v * rate
+    # unit per value (NaN falls through to the plain amount, as in fmt)
+    unit = np.select([v >= t for t in thresholds], range(len(thresholds)), len(thresholds))
+    scaled = v / np.array([*thresholds, 1], dtype="float64")[unit]
+    return [formats[u].format(x) for u, x in zip(unit.tolist(), scaled.tolist())]
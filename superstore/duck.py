@@ -0,0 +1,216 @@
+"""Optional DuckDB backend — filters and chart aggregations pushed down as SQL.
+
+The dataset's rows are registered (zero-copy, via Arrow) in an in-process
+DuckDB database; every chart table is one SQL query that returns only the
+small result frame, run multi-threaded with spilling to CACHE_DIR. Tables
+with no SQL form here (grid positions, the explorer summary) fall back to
+the pandas engine view. Requires `pip install duckdb`.
+"""
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from .cube import DAYS
+from .store import CACHE_DIR
+
+try:
+    import duckdb
+except ImportError:  # optional dependency
+    duckdb = None
+
+AVAILABLE = duckdb is not None
+# DuckDB's own memory cap before it spills to disk
+MEMORY_LIMIT = "4GB"
+
+
+def _q(col):
+    return '"' + col.replace('"', '""') + '"'
+
+
+def _total(col):
+    """SQL sum of `col` — 0, as pandas' sum, when every value is missing."""
+    return f"coalesce(sum({_q(col)}), 0)"
+
+
+class Dataset:
+    """An engine.Dataset whose rows are also queryable through DuckDB."""
+
+    def __init__(self, ds):
+        if not AVAILABLE:
+            raise ImportError("the DuckDB backend needs `pip install duckdb`")
+        self.ds = ds
+        self.con = duckdb.connect(config={"memory_limit": MEMORY_LIMIT,
+                                          "temp_directory": str(CACHE_DIR / "duckdb")})
+
+    def cursor(self):
+        """A connection of its own per query (thread-safe) with the rows registered as `rows`."""
+        cur = self.con.cursor()
+        cur.register("rows", self.ds.df)
+        return cur
+
+    def view(self, date_range=None, selections=None, memo=None):
+        return View(self, date_range, selections, memo)
+
+
+class View(engine.View):
+    """engine.View with its chart tables computed by DuckDB over the rows."""
+
+    def __init__(self, dd, date_range=None, selections=None, memo=None):
+        super().__init__(dd.ds, date_range, selections, memo)
+        self.dd = dd
+        where, params = [], []
+        if self.date_range and self.ds.has("Order Date"):
+            where.append('"Order Date" >= ? AND "Order Date" < ?')
+            params += [self.date_range[0], self.date_range[1] + dt.timedelta(days=1)]
+        for col, values in self.selections.items():
+            if values and self.ds.has(col):
+                where.append(f"{_q(col)}::VARCHAR IN ({', '.join('?' * len(values))})")
+                params += [str(v) for v in values]
+        self.where = " WHERE " + " AND ".join(where) if where else ""
+        self.params = params
+
+    def sql(self, select, group="", order="", extra=""):
+        """Run `SELECT … FROM rows <filters> …` → DataFrame (a cursor per call: thread-safe)."""
+        group = f" GROUP BY {group}" if group else ""
+        order = f" ORDER BY {order}" if order else ""
+        query = f"SELECT {select} FROM rows{self.where}{extra}{group}{order}"
+        return self.dd.cursor().execute(query, self.params).df()
+
+    def _and(self, cond):
+        return f" AND {cond}" if self.where else f" WHERE {cond}"
+
+    def _sum(self, dims, measures, order=None):
+        """Sum `measures` by `dims` (Orders = row count), missing dimension values dropped."""
+        cols = ", ".join(_q(d) for d in dims)
+        sums = ", ".join("count(*) AS Orders" if m == "Orders" else f"{_total(m)} AS {_q(m)}"
+                         for m in measures)
+        return self.sql(f"{cols}, {sums}", cols, order or cols,
+                        self._and(" AND ".join(f"{_q(d)} IS NOT NULL" for d in dims)))
+
+    def kpis(self):
+        def compute():
+            has = self.ds.has
+            r = self.sql(", ".join([
+                'sum("Sales") AS sales', "count(*) AS orders", 'count("Sales") AS sales_count',
+                'sum("Profit") AS profit' if has("Profit") else "0 AS profit",
+                'sum("Quantity") AS quantity' if has("Quantity") else "NULL AS quantity",
+                'count(DISTINCT "Customer ID") AS customers' if has("Customer ID")
+                else "count(*) AS customers"])).iloc[0]
+            sales, orders = 0 if pd.isna(r["sales"]) else r["sales"], int(r["orders"])
+            n = int(r["sales_count"])
+            profit = 0 if pd.isna(r["profit"]) else r["profit"]
+            return engine.KPIs(sales, orders, sales / n if n else 0, profit,
+                               profit / sales * 100 if has("Profit") and sales else 0,
+                               None if pd.isna(r["quantity"]) else r["quantity"],
+                               int(r["customers"]))
+        return self.memo("kpis", compute)
+
+    # ─── Sales trends ──────────────────────────────────────────
+    def yoy(self):
+        return self.memo("yoy", lambda: self.sql(
+            f'year("Order Date") AS Year, month("Order Date") AS Month, {_total("Sales")} AS Sales',
+            "1, 2", "1, 2", self._and('"Order Date" IS NOT NULL')))
+
+    def category_monthly(self):
+        return self.memo("category_monthly", lambda: self.sql(
+            f'date_trunc(\'month\', "Order Date") AS YM, "Category", {_total("Sales")} AS Sales',
+            "1, 2", "1, 2", self._and('"Order Date" IS NOT NULL AND "Category" IS NOT NULL')))
+
+    def weekday(self):
+        return self.memo("weekday", lambda: self.sql(
+            f'dayname("Order Date") AS DayOfWeek, {_total("Sales")} AS Sales', "1", "",
+            self._and('"Order Date" IS NOT NULL'))
+            .set_index("DayOfWeek").reindex(DAYS).reset_index())
+
+    def ship_mode(self):
+        return self.memo("ship_mode", lambda: self._sum(["Ship Mode"], ["Sales"], "Sales"))
+
+    # ─── Regional ──────────────────────────────────────────────
+    def region(self):
+        return self.memo("region", lambda: self._sum(["Region"], ["Sales", "Orders"])
+                         .assign(Share=lambda r: (r["Sales"] / r["Sales"].sum() * 100).round(1)))
+
+    def state(self):
+        return self.memo("state", lambda: self._sum(["State"], ["Sales"], '"Sales" DESC'))
+
+    def region_category(self):
+        return self.memo("region_category", lambda: self._sum(["Region", "Category"], ["Sales"])
+            .pivot(index="Region", columns="Category", values="Sales").fillna(0))
+
+    # ─── Products ──────────────────────────────────────────────
+    def category_sales(self):
+        return self.memo("category_sales", lambda: self._sum(["Category"], ["Sales"]))
+
+    def subcategory_sales(self):
+        return self.memo("subcategory_sales", lambda: self._sum(["Sub-Category"], ["Sales"], "Sales"))
+
+    def subcategory(self):
+        return self.memo("subcategory", lambda: self._sum(
+            ["Sub-Category"], ["Sales", "Profit", "Orders"])
+            .assign(Margin=lambda b: (b["Profit"] / b["Sales"] * 100).round(1)))
+
+    def top_products(self, n=10):
+        return self.memo("top_products", lambda: self.sql(
+            f'"Product Name", {_total("Sales")} AS Sales', "1", f'"Sales" DESC LIMIT {int(n)}',
+            self._and('"Product Name" IS NOT NULL'))
+            .assign(Short=lambda t: t["Product Name"].astype(str).str[:44]))
+
+    # ─── Profitability ─────────────────────────────────────────
+    def category_profit(self):
+        return self.memo("category_profit", lambda: self._sum(["Category"], ["Profit"]))
+
+    def region_margin(self):
+        return self.memo("region_margin", lambda: self._sum(["Region"], ["Sales", "Profit"])
+            .assign(Margin=lambda r: (r["Profit"] / r["Sales"] * 100).round(2)))
+
+    def _bins(self, col, bins):
+        """Edges of `bins` equal-width bins over the filtered range of `col`, as np.histogram."""
+        lo, hi = self.sql(f"min({_q(col)}), max({_q(col)})").iloc[0]
+        if pd.isna(lo):
+            lo, hi = 0.0, 1.0
+        if lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        return np.linspace(lo, hi, bins + 1)
+
+    def _bucket(self, col, edges):
+        lo, width, n = float(edges[0]), float(edges[1] - edges[0]), len(edges) - 1
+        return f"least(CAST(floor(({_q(col)} - {lo!r}) / {width!r}) AS INTEGER), {n - 1})"
+
+    def profit_histogram(self, bins=engine.HISTOGRAM_BINS):
+        def compute():
+            edges = self._bins("Profit", bins)
+            r = self.sql(f"{self._bucket('Profit', edges)} AS b, count(*) AS n", "1", "",
+                         self._and('"Profit" IS NOT NULL'))
+            counts = np.zeros(bins, "int64")
+            counts[r["b"].to_numpy("int64")] = r["n"].to_numpy("int64")
+            return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+        return self.memo("profit_histogram", compute)
+
+    def discount_density(self, bins=engine.DENSITY_BINS):
+        def compute():
+            xe, ye = self._bins("Discount", bins[0]), self._bins("Profit", bins[1])
+            r = self.sql(f"{self._bucket('Discount', xe)} AS x, {self._bucket('Profit', ye)} AS y, "
+                         "count(*) AS n", "1, 2", "",
+                         self._and('"Discount" IS NOT NULL AND "Profit" IS NOT NULL'))
+            counts = np.zeros((bins[1], bins[0]), "int64")
+            counts[r["y"].to_numpy("int64"), r["x"].to_numpy("int64")] = r["n"].to_numpy("int64")
+            return pd.DataFrame(counts, index=(ye[:-1] + ye[1:]) / 2, columns=(xe[:-1] + xe[1:]) / 2)
+        return self.memo("discount_density", compute)
+
+    def discount_sample(self, n=3000):
+        # sampled after filtering — USING SAMPLE on `rows` itself would run before WHERE
+        return self.memo("discount_sample", lambda: self.dd.cursor().execute(
+            f"SELECT * FROM (SELECT * FROM rows{self.where}) "
+            f"USING SAMPLE reservoir({int(n)} ROWS) REPEATABLE (42)", self.params).df())
+
+    def discount_bands(self):
+        def compute():
+            edges, labels = engine.DISCOUNT_BANDS
+            case = " ".join(f'WHEN "Discount" <= {hi!r} THEN {i}' for i, hi in enumerate(edges[1:]))
+            r = self.sql(f'CASE {case} END AS band, avg("Profit") AS "Avg Profit"', "1", "1",
+                         self._and(f'"Discount" >= {edges[0]!r} AND "Discount" <= {edges[-1]!r}'))
+            return pd.DataFrame({"Disc Range": pd.Categorical.from_codes(r["band"], labels, ordered=True),
+                                 "Avg Profit": r["Avg Profit"]})
+        return self.memo("discount_bands", compute)
@@ -0,0 +1,369 @@
+"""Headless dashboard engine — every KPI and chart table as a plain DataFrame.
+
+    ds = Dataset.from_csv("superstore.csv")
+    view = ds.view((date(2016, 1, 1), date(2016, 6, 30)), {"Region": ["West"]})
+    view.kpis(), view.trend("Week"), view.aggregates()
+
+The Streamlit app drives the same `View` methods; run as a module to
+precompute the dashboard aggregates of a CSV in batch:
+
+    python -m superstore.engine superstore.csv --out aggregates/ --by Region
+"""
+import argparse
+import json
+from collections import namedtuple
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import cube as cubes, grid, kernel, profiling, pyramid, store
+from .cube import rollup
+from .filters import FILTER_DIMS, FilterIndex, select
+
+REQUIRED = ["Sales", "Region", "Category"]
+
+KPIs = namedtuple("KPIs", "sales orders avg_order profit margin_pct quantity customers")
+
+# chart table → row-level columns it needs (tables whose columns are missing are skipped)
+CHARTS = {
+    "trend": ["Order Date"],
+    "yoy": ["Order Date"],
+    "category_monthly": ["Order Date"],
+    "weekday": ["Order Date"],
+    "ship_mode": ["Ship Mode"],
+    "region": [],
+    "state": ["State"],
+    "region_category": [],
+    "category_sales": [],
+    "subcategory_sales": ["Sub-Category"],
+    "subcategory": ["Sub-Category", "Profit"],
+    "top_products": ["Product Name"],
+    "category_profit": ["Profit"],
+    "region_margin": ["Profit"],
+    "profit_histogram": ["Profit"],
+    "discount_density": ["Discount", "Profit"],
+    "discount_sample": ["Discount", "Profit"],
+    "discount_bands": ["Discount", "Profit"],
+}
+
+# dashboard tab → the View tables it shows
+TABS = {
+    "sales_trends": ["trend", "yoy", "category_monthly", "weekday", "ship_mode"],
+    "regional": ["region", "state", "region_category"],
+    "products": ["category_sales", "subcategory_sales", "subcategory", "top_products"],
+    "profitability": ["category_profit", "region_margin", "trend",
+                      "profit_histogram", "discount_density", "discount_bands"],
+    "data_explorer": ["positions", "describe"],
+}
+
+# row-level distributions are binned here — the browser gets a fixed number of cells
+HISTOGRAM_BINS = 50
+DENSITY_BINS = (20, 40)  # Discount × Profit
+
+DISCOUNT_BANDS = ([0, .1, .2, .3, .5, 1.0], ["0-10%", "10-20%", "20-30%", "30-50%", "50%+"])
+
+
+class Dataset:
+    """A loaded dataset with its cube, time pyramid, partition profile and filter indexes.
+
+    `df` is the row-level frame (the uniform sample when `streaming`), `cube`
+    the grain-level aggregates and `mem` the ingest info from store.load /
+    cube.stream.
+    """
+
+    def __init__(self, df, cube, mem, streaming=False):
+        self.df, self.cube, self.mem, self.streaming = df, cube, mem, streaming
+        self.shift = mem.get("shift") or profiling.shifts(df)
+        self.stats = mem["stats"] if streaming else profiling.partition_stats(df, self.shift)
+        self.order = np.random.default_rng(0).permutation(len(df))
+        self.columns = profiling.columns(df)
+        self.row_ix = FilterIndex(df)
+        self.cube_ix = FilterIndex(cube, "YM")
+        self.stats_ix = FilterIndex(self.stats, "YM")
+        self.pyramid = None
+        if self.has("Order Date"):
+            self.pyramid = pyramid.Pyramid(mem["days"] if streaming else pyramid.days(df))
+
+    @classmethod
+    def from_csv(cls, path, streaming=False):
+        """Parse (or reuse the on-disk cache of) a CSV; `streaming` aggregates it in chunks."""
+        with open(path, "rb") as f:
+            if streaming:
+                df, cube, mem = cubes.stream(f)
+                return cls(df, cube, mem, streaming=True)
+            df, mem = store.load(f)
+        return cls(df, cubes.aggregate(df), mem)
+
+    @property
+    def nbytes(self):
+        """Resident bytes of the rows, cube, partition stats and indexes."""
+        frames = [self.df, self.cube, self.stats, self.columns]
+        return (sum(int(f.memory_usage(deep=True).sum()) for f in frames) + self.order.nbytes
+                + self.row_ix.nbytes + self.cube_ix.nbytes + self.stats_ix.nbytes
+                + (self.pyramid.nbytes if self.pyramid else 0))
+
+    def missing(self):
+        return [c for c in REQUIRED if c not in self.df.columns]
+
+    def has(self, *cols):
+        return all(c in self.df.columns for c in cols)
+
+    def date_bounds(self):
+        if self.streaming:
+            return self.mem["date_min"].date(), self.mem["date_max"].date()
+        d = self.df["Order Date"]
+        return d.min().date(), d.max().date()
+
+    def options(self, col):
+        """Sorted distinct values of a filter column (from the cube — exact when streaming)."""
+        return sorted((self.cube if self.streaming else self.df)[col].dropna().unique())
+
+    def view(self, date_range=None, selections=None, memo=None):
+        return View(self, date_range, selections, memo)
+
+
+class View:
+    """One filter state of a Dataset; every method returns a read-only table.
+
+    `memo(name, compute)` memoizes each table (the app passes its shared LRU);
+    the default keeps them for the life of the view.
+    """
+
+    def __init__(self, ds, date_range=None, selections=None, memo=None):
+        self.ds = ds
+        self.date_range = tuple(date_range) if date_range and len(date_range) == 2 else None
+        self.selections = selections or {}
+        self.mask = ds.row_ix.mask(self.date_range, self.selections)
+        if memo is None:
+            tables = {}
+            memo = lambda name, compute: tables[name] if name in tables \
+                else tables.setdefault(name, compute())
+        self.memo = memo
+
+    @cached_property
+    def rows(self):
+        """Row-level filtered frame — built on first use only."""
+        return select(self.ds.df, self.mask)
+
+    def values(self, col):
+        """One column of the filtered rows as a float array, without copying the frame."""
+        x = self.ds.df[col].to_numpy("float64")
+        return x if self.mask is None else x[self.mask]
+
+    # charts roll up from the monthly cube (the explorer's profile from monthly
+    # partition stats); partial months at the ends of the date range come from the
+    # rows instead (streaming has only a sample → whole months)
+    def _filtered(self, table, ix, build):
+        ds, whole, edges = self.ds, None, []
+        if self.date_range:
+            if ds.streaming:
+                whole = (self.date_range[0].replace(day=1), self.date_range[1])
+            else:
+                whole, edges = cubes.month_split(*self.date_range)
+        parts = [build(select(ds.df, ds.row_ix.mask(e, self.selections))) for e in edges]
+        if whole or not edges:
+            parts.append(select(table, ix.mask(whole, self.selections)))
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    @property
+    def cube(self):
+        return self.memo("fcube", lambda: self._filtered(
+            self.ds.cube, self.ds.cube_ix, cubes.aggregate))
+
+    @property
+    def stats(self):
+        shift = self.ds.shift
+        return self.memo("fstats", lambda: self._filtered(
+            self.ds.stats, self.ds.stats_ix, lambda rows: profiling.partition_stats(rows, shift)))
+
+    def kpis(self):
+        def compute():
+            fc, has = self.cube, self.ds.has
+            sales, orders = fc["Sales"].sum(), int(fc["Orders"].sum())
+            n = int(fc["Sales Count"].sum())  # average over rows with a Sales value, as Sales.mean()
+            profit = fc["Profit"].sum() if has("Profit") else 0
+            return KPIs(sales, orders, sales / n if n else 0, profit,
+                        (profit / sales * 100) if has("Profit") and sales else 0,
+                        fc["Quantity"].sum() if has("Quantity") else None,
+                        kernel.distinct(self.ds.df["Customer ID"], self.mask) if has("Customer ID")
+                        else orders)
+        return self.memo("kpis", compute)
+
+    # ─── Sales trends ──────────────────────────────────────────
+    def span(self, window=None):
+        """Inclusive (first, last) date a trend covers — the date range narrowed by `window`."""
+        return pyramid.intersect(self.date_range, window) or self.ds.pyramid.bounds
+
+    def trend(self, level=None, window=None):
+        """Sales / Orders (+ 3-period moving average, Profit / Margin) per day … year.
+
+        Read from the time pyramid; `level` None picks it from the span and
+        `window` narrows the date range further (chart drilldown).
+        """
+        rng = pyramid.intersect(self.date_range, window)
+        level = level or pyramid.auto(*self.span(window))
+
+        def compute():
+            t = self.ds.pyramid.trend(level, rng, self.selections)
+            t["MA3"] = t["Sales"].rolling(3, min_periods=1).mean()
+            if "Profit" in t:
+                t["Margin"] = (t["Profit"] / t["Sales"] * 100).round(2)
+            return t
+        return self.memo(("trend", level, rng), compute)
+
+    def yoy(self):
+        return self.memo("yoy", lambda: rollup(
+            self.cube.assign(Year=self.cube["YM"].dt.year, Month=self.cube["YM"].dt.month),
+            ["Year", "Month"], ["Sales"]))
+
+    def category_monthly(self):
+        return self.memo("category_monthly", lambda: rollup(self.cube, ["YM", "Category"], ["Sales"]))
+
+    def weekday(self):
+        return self.memo("weekday", lambda: rollup(self.cube, "DayOfWeek", ["Sales"])
+                         .set_index("DayOfWeek").reindex(cubes.DAYS).reset_index())
+
+    def ship_mode(self):
+        return self.memo("ship_mode", lambda: rollup(self.cube, "Ship Mode", ["Sales"])
+                         .sort_values("Sales"))
+
+    # ─── Regional ──────────────────────────────────────────────
+    def region(self):
+        return self.memo("region", lambda: rollup(self.cube, "Region", ["Sales", "Orders"]).assign(
+            Share=lambda r: (r["Sales"] / r["Sales"].sum() * 100).round(1)))
+
+    def state(self):
+        return self.memo("state", lambda: rollup(self.cube, "State", ["Sales"])
+                         .sort_values("Sales", ascending=False))
+
+    def region_category(self):
+        return self.memo("region_category", lambda: kernel.matrix(
+            self.cube, "Region", "Category", "Sales"))
+
+    # ─── Products ──────────────────────────────────────────────
+    def category_sales(self):
+        return self.memo("category_sales", lambda: rollup(self.cube, "Category", ["Sales"]))
+
+    def subcategory_sales(self):
+        return self.memo("subcategory_sales", lambda: rollup(self.cube, "Sub-Category", ["Sales"])
+                         .sort_values("Sales"))
+
+    def subcategory(self):
+        return self.memo("subcategory", lambda: rollup(
+            self.cube, "Sub-Category", ["Sales", "Profit", "Orders"])
+            .assign(Margin=lambda b: (b["Profit"] / b["Sales"] * 100).round(1)))
+
+    def top_products(self, n=10):
+        return self.memo("top_products", lambda: kernel.group(
+            self.ds.df, "Product Name", ["Sales"], self.mask)
+            .sort_values("Sales", ascending=False).head(n).reset_index(drop=True)
+            .assign(Short=lambda t: t["Product Name"].astype(str).str[:44]))
+
+    # ─── Profitability ─────────────────────────────────────────
+    def category_profit(self):
+        return self.memo("category_profit", lambda: rollup(self.cube, "Category", ["Profit"]))
+
+    def region_margin(self):
+        return self.memo("region_margin", lambda: rollup(self.cube, "Region", ["Sales", "Profit"])
+                         .assign(Margin=lambda r: (r["Profit"] / r["Sales"] * 100).round(2)))
+
+    def profit_mean(self):
+        """Profit averaged over rows with a Profit value, as Profit.mean() (None: there are none)."""
+        def compute():
+            fc = self.cube
+            n = int(fc["Profit Count"].sum())
+            return fc["Profit"].sum() / n if n else None
+        return self.memo("profit_mean", compute)
+
+    def profit_histogram(self, bins=HISTOGRAM_BINS):
+        """Profit distribution as equal-width bars: left / right edge and row count."""
+        def compute():
+            x = self.values("Profit")
+            counts, edges = np.histogram(x[~np.isnan(x)], bins=bins)
+            return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+        return self.memo("profit_histogram", compute)
+
+    def discount_density(self, bins=DENSITY_BINS):
+        """Row counts on a Discount × Profit grid — Profit bin centres × Discount bin centres."""
+        def compute():
+            x, y = self.values("Discount"), self.values("Profit")
+            ok = ~(np.isnan(x) | np.isnan(y))
+            counts, xe, ye = np.histogram2d(x[ok], y[ok], bins=bins)
+            return pd.DataFrame(counts.T.astype("int64"), index=(ye[:-1] + ye[1:]) / 2,
+                                columns=(xe[:-1] + xe[1:]) / 2)
+        return self.memo("discount_density", compute)
+
+    def discount_sample(self, n=3000):
+        return self.memo("discount_sample", lambda: self.rows.sample(
+            min(n, len(self.rows)), random_state=42))
+
+    def discount_bands(self):
+        def compute():
+            df = self.ds.df
+            bands = kernel.cut(df["Discount"], *DISCOUNT_BANDS).rename("Disc Range")
+            return kernel.group(df, bands, ["Profit"], self.mask, mean=True) \
+                .rename(columns={"Profit": "Avg Profit"})
+        return self.memo("discount_bands", compute)
+
+    # ─── Data explorer ─────────────────────────────────────────
+    def positions(self):
+        return self.memo("positions", lambda: grid.positions(self.mask, len(self.ds.df)))
+
+    def describe(self):
+        """Summary statistics of the numeric columns (None when there are none)."""
+        ds = self.ds
+        if not ds.shift:
+            return None
+        return self.memo("describe", lambda: profiling.describe(
+            self.stats, ds.shift,
+            ds.df.iloc[profiling.sample_positions(ds.order, self.mask)]).round(2))
+
+    def aggregates(self):
+        """Every chart table the dataset's columns support, by name."""
+        return {name: getattr(self, name)() for name, cols in CHARTS.items() if self.ds.has(*cols)}
+
+
+def _write(view, out):
+    out.mkdir(parents=True, exist_ok=True)
+    kpis = {k: None if v is None else v.item() if hasattr(v, "item") else v
+            for k, v in view.kpis()._asdict().items()}
+    (out / "kpis.json").write_text(json.dumps(kpis, indent=2))
+    tables = {**view.aggregates(), "describe": view.describe()}
+    for name, table in tables.items():
+        if table is None:
+            continue
+        if not isinstance(table.index, pd.RangeIndex):
+            table = table.reset_index()
+        table.columns = [str(c) for c in table.columns]
+        table.to_parquet(out / f"{name}.parquet", index=False)
+    return len(tables)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Precompute the dashboard aggregates of a CSV.")
+    ap.add_argument("csv")
+    ap.add_argument("--out", required=True, help="directory for kpis.json + one Parquet per table")
+    ap.add_argument("--streaming", action="store_true", help="aggregate the CSV in chunks")
+    ap.add_argument("--by", action="append", default=[], choices=FILTER_DIMS,
+                    help="also write one subdirectory per value of this filter (repeatable)")
+    args = ap.parse_args(argv)
+
+    ds = Dataset.from_csv(args.csv, args.streaming)
+    if ds.missing():
+        raise SystemExit(f"required columns missing: {', '.join(ds.missing())}")
+    out = Path(args.out)
+    n = _write(ds.view(), out)
+    print(f"{out}: {n} tables")
+    for dim in args.by:
+        if not ds.has(dim):
+            continue
+        for value in ds.options(dim):
+            sub = out / f"{dim}={value}"
+            n = _write(ds.view(selections={dim: [value]}), sub)
+            print(f"{sub}: {n} tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""On-demand dataset export — written in row chunks to a temp file."""
+import gzip
+import io
+import os
+import tempfile
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# label → (file extension, MIME type)
+FORMATS = {
+    "CSV":        (".csv",     "text/csv"),
+    "CSV (gzip)": (".csv.gz",  "application/gzip"),
+    "Parquet":    (".parquet", "application/vnd.apache.parquet"),
+}
+EXPORT_CHUNK_ROWS = 100_000
+
+
+def _write_csv(df, raw, chunk_rows):
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    for start in range(0, max(len(df), 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+    text.flush()
+    text.detach()
+
+
+def _write_parquet(df, raw, chunk_rows):
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(raw, schema) as writer:
+        for start in range(0, max(len(df), 1), chunk_rows):
+            part = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+
+
+def export(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Serialize `df` as `fmt` (a FORMATS key) → file opened for binary reading.
+
+    Rows are encoded `chunk_rows` at a time straight to disk, so the output
+    never sits in memory as a str plus its encoded bytes. st.download_button
+    still reads the finished file into one bytes object to serve it. The file
+    is deleted once the returned handle is closed.
+    """
+    with tempfile.NamedTemporaryFile(suffix=FORMATS[fmt][0], delete=False) as out:
+        path = out.name
+        try:
+            if fmt == "Parquet":
+                _write_parquet(df, out.file, chunk_rows)
+            elif fmt == "CSV (gzip)":
+                with gzip.GzipFile(fileobj=out.file, mode="wb") as gz:
+                    _write_csv(df, gz, chunk_rows)
+            else:
+                _write_csv(df, out.file, chunk_rows)
+        except BaseException:
+            out.close()
+            os.unlink(path)
+            raise
+    # Streamlit accepts an io.BufferedReader, not the read/write temp file object.
+    # Windows deletes an O_TEMPORARY file on close; elsewhere unlink it now.
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_TEMPORARY", 0))
+    if not hasattr(os, "O_TEMPORARY"):
+        os.unlink(path)
+    return open(fd, "rb")
@@ -0,0 +1,65 @@
+"""Built Plotly figures, cached by what they were drawn from.
+
+Building a figure (px.* / go.Figure, update_layout, update_axes) runs Plotly's
+property validation on every call, which costs more than the aggregation it
+plots once that is cached. A figure is a pure function of its chart, the
+tables and scalars it draws, and the currency of its labels, so it is cached
+under (chart id, `fingerprint` of those inputs, currency, rate) and rebuilt only
+when one of them changes.
+
+Figures are kept as built objects rather than JSON specs: st.plotly_chart
+re-validates a dict spec by rebuilding a Figure from it, but takes a Figure as
+is. Cached figures are shared between sessions — never update them in place.
+"""
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from .cache import LRUCache, _MISS, sizeof
+
+
+def fingerprint(*inputs):
+    """Content hash of the frames / series / arrays / scalars a figure draws."""
+    h = hashlib.blake2b(digest_size=16)
+    for x in inputs:
+        if isinstance(x, (pd.DataFrame, pd.Series)):
+            frame = x.to_frame() if isinstance(x, pd.Series) else x
+            h.update(repr((type(x).__name__, list(frame.columns), list(map(str, frame.dtypes)))).encode())
+            h.update(pd.util.hash_pandas_object(x, index=True).to_numpy().tobytes())
+        elif isinstance(x, np.ndarray):
+            h.update(repr((x.dtype.str, x.shape)).encode())
+            h.update(np.ascontiguousarray(x).tobytes())
+        else:
+            h.update(repr(x).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class FigureCache(LRUCache):
+    """LRUCache of figures keyed (chart id, …) with hit/miss counts per chart."""
+
+    def __init__(self, maxsize=256, ttl=None, name="figures"):
+        super().__init__(maxsize, ttl, name)
+        self.charts = {}  # chart id → [hits, misses]
+
+    def get(self, key, build):
+        """`(figure, hit)` — the cached figure under `key`, else `build()`'s."""
+        fig = self._lookup(key)
+        hit = fig is not _MISS
+        if not hit:
+            fig = build()
+            self.put(key, fig)
+        with self._lock:
+            self.charts.setdefault(key[0], [0, 0])[not hit] += 1
+        return fig, hit
+
+    def sizeof(self, fig):
+        return sizeof(fig.to_plotly_json())
+
+    def chart_stats(self):
+        """One row per chart id, most looked-up first."""
+        with self._lock:
+            rows = [{"chart": c, "hits": h, "misses": m, "hit_rate": round(h / (h + m), 3)}
+                    for c, (h, m) in self.charts.items()]
+        return sorted(rows, key=lambda r: -(r["hits"] + r["misses"]))
@@ -0,0 +1,81 @@
+"""Per-dataset filter index — sidebar selections → row mask without scanning strings or dates."""
+import numpy as np
+import pandas as pd
+
+FILTER_DIMS = ["Region", "Category", "Segment", "Ship Mode"]
+
+
+class FilterIndex:
+    """Category code arrays per filter column + a sorted date index.
+
+    Built once per dataset; every rerun then resolves its filters with
+    one lookup-table gather per column and two binary searches.
+    """
+
+    def __init__(self, df, date_col="Order Date", dims=FILTER_DIMS):
+        self.n = len(df)
+        self.codes, self.categories = {}, {}
+        for c in dims:
+            if c in df.columns:
+                s = df[c] if isinstance(df[c].dtype, pd.CategoricalDtype) else df[c].astype("category")
+                self.codes[c] = s.cat.codes.to_numpy()
+                self.categories[c] = s.cat.categories
+        # columns with missing values (code -1) — a selection drops those rows even when
+        # it holds every value, as `isin` does
+        self.missing = {c: bool((codes < 0).any()) for c, codes in self.codes.items()}
+        self.order = self.dates = None
+        self.n_dated = self.n
+        if date_col in df.columns:
+            d = df[date_col].to_numpy()
+            self.order = np.argsort(d, kind="stable")  # NaT sorts last
+            self.dates = d[self.order]
+            self.n_dated = self.n - int(np.isnat(self.dates).sum())
+
+    @property
+    def nbytes(self):
+        arrays = [*self.codes.values(), self.order, self.dates]
+        return sum(a.nbytes for a in arrays if a is not None)
+
+    def _date_mask(self, start, end):
+        lo = np.searchsorted(self.dates, np.datetime64(start, "D"), "left")
+        hi = min(np.searchsorted(self.dates, np.datetime64(end, "D") + 1, "left"), self.n_dated)
+        if lo == 0 and hi == self.n:  # every row dated and in range
+            return None
+        m = np.zeros(self.n, bool)
+        m[self.order[lo:hi]] = True
+        return m
+
+    def _value_mask(self, col, values):
+        cats = self.categories[col]
+        # extra trailing slot so code -1 (missing) never matches
+        hit = np.zeros(len(cats) + 1, bool)
+        hit[cats.get_indexer(list(values))] = True
+        hit[-1] = False
+        if hit[:-1].all() and not self.missing[col]:
+            return None
+        return hit[self.codes[col]]
+
+    def mask(self, date_range=None, selections=None):
+        """Boolean row mask, or None when nothing is filtered out.
+
+        `date_range` is an inclusive (start, end) pair of dates; each entry of
+        `selections` maps a filter column to its selected values — an empty
+        selection means "no filter", as in the sidebar. As with the pandas
+        comparison / `isin` filters, a date range drops undated rows and a
+        selection drops rows missing that column.
+        """
+        parts = []
+        if date_range and len(date_range) == 2 and self.dates is not None:
+            parts.append(self._date_mask(*date_range))
+        for col, values in (selections or {}).items():
+            if values and col in self.codes:
+                parts.append(self._value_mask(col, values))
+        parts = [p for p in parts if p is not None]
+        if not parts:
+            return None
+        return np.logical_and.reduce(parts)
+
+
+def select(df, mask):
+    """Rows of `df` under `mask` — `df` itself (no copy) when unfiltered."""
+    return df if mask is None else df[mask]
@@ -0,0 +1,55 @@
+"""Server-side search / sort / paging for the Data Explorer grid."""
+import numpy as np
+import pandas as pd
+
+PAGE_SIZES = [25, 50, 100, 250, 1000]
+
+
+def positions(mask, n):
+    """Row positions selected by a FilterIndex mask (None → every row)."""
+    return np.arange(n) if mask is None else np.flatnonzero(mask)
+
+
+def _contains(s, rows, text):
+    """Case-insensitive substring match of `text` in `s` at `rows`, as a bool array."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        # match the (few) category labels once, then gather by code
+        hit = s.cat.categories.astype(str).str.contains(text, case=False, regex=False)
+        return np.append(np.asarray(hit), False)[s.cat.codes.to_numpy()[rows]]
+    if pd.api.types.is_string_dtype(s.dtype):
+        return s.iloc[rows].str.contains(text, case=False, regex=False, na=False).to_numpy()
+    return np.zeros(len(rows), bool)
+
+
+def _sort_key(s, rows):
+    """Rank of `s` at `rows` as ints — equal values share a rank, missing ones are -1."""
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        rank = np.argsort(np.argsort(s.cat.categories.astype(str)))
+        return np.append(rank, -1)[s.cat.codes.to_numpy()[rows]]
+    # factorize ranks without comparing values to NA (which str / StringDtype can't)
+    return pd.factorize(s.iloc[rows], sort=True)[0]
+
+
+def select_rows(df, rows, search="", columns=(), sort_by=None, descending=False):
+    """Narrow `rows` to those matching `search` in any of `columns`, then order them.
+
+    Works on one column at a time — the filtered frame itself is never built.
+    """
+    if search:
+        hit = np.zeros(len(rows), bool)
+        for c in columns:
+            hit |= _contains(df[c], rows, search)
+        rows = rows[hit]
+    if sort_by:
+        # as sort_values(kind="stable", na_position="last"): ties keep their order,
+        # missing values go last either way
+        key = _sort_key(df[sort_by], rows).astype("int64")
+        key = np.where(key < 0, np.iinfo("int64").max, -key if descending else key)
+        rows = rows[np.argsort(key, kind="stable")]
+    return rows
+
+
+def page(df, rows, columns, number, size):
+    """Materialize only the `number`-th page (0-based) of `rows`, projected to `columns`."""
+    take = rows[number * size:(number + 1) * size]
+    return df.iloc[take, df.columns.get_indexer(columns)].reset_index(drop=True)
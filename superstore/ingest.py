@@ -0,0 +1,76 @@
+"""Schema-aware CSV ingest — typed, memory-compact DataFrames."""
+import numpy as np
+import pandas as pd
+
+# ─── Known Superstore columns ─────────────────────────────────
+DATE_COLS = ["Order Date", "Ship Date"]
+CATEGORY_COLS = [
+    "Region", "Category", "Sub-Category", "Segment", "Ship Mode",
+    "State", "City", "Country", "Product Name", "Product ID",
+    "Customer ID", "Customer Name",
+]
+NUMERIC_COLS = ["Sales", "Profit", "Discount", "Quantity"]
+
+# unknown text columns are categorised when at most this share of values is unique
+CATEGORY_MAX_RATIO = 0.5
+
+
+def parse_dates(df):
+    for c in DATE_COLS:
+        if c in df.columns:
+            df[c] = pd.to_datetime(df[c], dayfirst=True, errors="coerce")
+    return df
+
+
+def _downcast(s):
+    """Narrowest dtype that holds every value of `s` exactly."""
+    s = pd.to_numeric(s, errors="coerce")
+    if s.dtype.kind == "f" and np.isfinite(s).all() and (s == np.floor(s)).all():
+        s = s.astype("int64")
+    if s.dtype.kind in "iu":
+        return pd.to_numeric(s, downcast="integer")
+    s32 = s.astype("float32")
+    # float32 only when lossless — e.g. Discount 0.2 must still land in the 10-20% band
+    lossless = (s32.astype("float64") == s) | s.isna()
+    return s32 if lossless.all() else s.astype("float64")
+
+
+def month(rows):
+    """Order Date truncated to the first of its month, as the YM key."""
+    d = rows["Order Date"]
+    return pd.Series(d.values.astype("datetime64[M]"), index=rows.index, name="YM")
+
+
+def compact(df):
+    """Categorical text columns + downcast numerics, in place."""
+    for c in df.columns:
+        s = df[c]
+        if c in NUMERIC_COLS:
+            df[c] = _downcast(s)
+        elif s.dtype == object or pd.api.types.is_string_dtype(s.dtype):
+            if c in CATEGORY_COLS or s.nunique() <= CATEGORY_MAX_RATIO * max(len(s), 1):
+                df[c] = s.astype("category")
+    return df
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def read_csv(f):
+    """Parse a Superstore CSV → (typed DataFrame, memory report)."""
+    df = parse_dates(pd.read_csv(f))
+    before = memory_bytes(df)
+    compact(df)
+    return df, {"raw_bytes": before, "bytes": memory_bytes(df)}
+
+
+# rows per chunk in streaming mode — bounds parse memory, not file size
+CHUNK_ROWS = 250_000
+
+
+def iter_csv(f, chunksize=CHUNK_ROWS):
+    """Yield typed DataFrames of at most `chunksize` rows."""
+    with pd.read_csv(f, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield compact(parse_dates(chunk))
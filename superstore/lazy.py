@@ -0,0 +1,255 @@
+"""Optional Polars backend — one lazy query plan per filter state.
+
+The dataset's rows are converted once to a Polars frame; a View builds the
+filtered rows (plus the `YM` month) as a LazyFrame and every chart table as
+a plan on top of it. The first table requested collects all of them together
+with `pl.collect_all`, so the filter and month derivation are shared and the
+group-bys run in parallel on Polars' thread pool (sized by POLARS_MAX_THREADS).
+Tables with no Polars form here (grid positions, the explorer summary, the
+scatter sample) fall back to the pandas engine view. Requires `pip install polars`.
+"""
+import datetime as dt
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from . import engine
+from .cube import DAYS
+
+try:
+    import polars as pl
+except ImportError:  # optional dependency
+    pl = None
+
+AVAILABLE = pl is not None
+
+
+class Dataset:
+    """An engine.Dataset whose rows are also held as a Polars frame."""
+
+    def __init__(self, ds):
+        if not AVAILABLE:
+            raise ImportError("the Polars backend needs `pip install polars`")
+        self.ds = ds
+        frame = pl.from_pandas(ds.df)
+        # Enum keeps the pandas category order, so sorted group-bys match the pandas engine
+        self.frame = frame.with_columns(
+            pl.col(c).cast(pl.Enum([str(v) for v in ds.df[c].cat.categories]))
+            for c in ds.df.columns if isinstance(ds.df[c].dtype, pd.CategoricalDtype))
+
+    @property
+    def nbytes(self):
+        return int(self.frame.estimated_size())
+
+    def view(self, date_range=None, selections=None, memo=None):
+        return View(self, date_range, selections, memo)
+
+
+def _bucket(col, bins):
+    """Equal-width bin index of `col` over its own min..max, as np.histogram bins it."""
+    x, lo, hi = pl.col(col), pl.col(col).min(), pl.col(col).max()
+    return (pl.when(hi > lo).then(((x - lo) * bins / (hi - lo)).floor().clip(0, bins - 1))
+            .otherwise(bins // 2).cast(pl.Int64))
+
+
+def _edges(lo, hi, bins):
+    if lo is None or np.isnan(lo):
+        lo, hi = 0.0, 1.0
+    if lo == hi:
+        lo, hi = lo - 0.5, hi + 0.5
+    return np.linspace(lo, hi, bins + 1)
+
+
+class View(engine.View):
+    """engine.View with its chart tables computed by Polars over the rows."""
+
+    def __init__(self, pds, date_range=None, selections=None, memo=None):
+        super().__init__(pds.ds, date_range, selections, memo)
+        lf = pds.frame.lazy()
+        if self.date_range and self.ds.has("Order Date"):
+            lo, hi = self.date_range
+            lf = lf.filter(pl.col("Order Date").is_between(
+                dt.datetime.combine(lo, dt.time()),
+                dt.datetime.combine(hi + dt.timedelta(days=1), dt.time()), closed="left"))
+        for col, values in self.selections.items():
+            if values and self.ds.has(col):
+                lf = lf.filter(pl.col(col).cast(pl.String).is_in([str(v) for v in values]))
+        if self.ds.has("Order Date"):
+            lf = lf.with_columns(YM=pl.col("Order Date").dt.truncate("1mo"))
+        self.lf = lf
+
+    def _sum(self, dims, measures, order=None, descending=False):
+        """Sum `measures` by `dims` (Orders = row count), missing dimension values dropped."""
+        aggs = [pl.len().alias("Orders") if m == "Orders" else pl.col(m).sum() for m in measures]
+        return self.lf.drop_nulls(dims).group_by(dims).agg(aggs) \
+            .sort(order or dims, descending=descending)
+
+    def _dated(self, by, aggs):
+        by = [by] if isinstance(by, (str, pl.Expr)) else by
+        keys = [b if isinstance(b, str) else b.meta.output_name() for b in by]
+        return self.lf.drop_nulls("Order Date").group_by(by).agg(aggs).sort(keys)
+
+    def _top(self, n):
+        return self._sum(["Product Name"], ["Sales"], "Sales", descending=True).head(n)
+
+    def _plans(self):
+        """Lazy plan of every table the dataset's columns support, by name."""
+        has, lf = self.ds.has, self.lf
+        plans = {"kpis": lf.select(
+            pl.col("Sales").sum().alias("sales"), pl.len().alias("orders"),
+            pl.col("Sales").fill_nan(None).count().alias("sales_count"),
+            (pl.col("Profit").sum() if has("Profit") else pl.lit(0)).alias("profit"),
+            (pl.col("Quantity").sum() if has("Quantity") else pl.lit(None)).alias("quantity"),
+            (pl.col("Customer ID").drop_nulls().n_unique() if has("Customer ID")
+             else pl.len()).alias("customers"))}
+        if has("Order Date"):
+            plans.update({
+                "yoy": self._dated([pl.col("Order Date").dt.year().alias("Year"),
+                                    pl.col("Order Date").dt.month().alias("Month")],
+                                   [pl.col("Sales").sum()]),
+                "category_monthly": self._sum(["YM", "Category"], ["Sales"]),
+                "weekday": self._dated(pl.col("Order Date").dt.to_string("%A").alias("DayOfWeek"),
+                                       [pl.col("Sales").sum()]),
+            })
+        if has("Ship Mode"):
+            plans["ship_mode"] = self._sum(["Ship Mode"], ["Sales"], "Sales")
+        plans["region"] = self._sum(["Region"], ["Sales", "Orders"])
+        if has("State"):
+            plans["state"] = self._sum(["State"], ["Sales"], "Sales", descending=True)
+        plans["region_category"] = self._sum(["Region", "Category"], ["Sales"])
+        plans["category_sales"] = self._sum(["Category"], ["Sales"])
+        if has("Sub-Category"):
+            plans["subcategory_sales"] = self._sum(["Sub-Category"], ["Sales"], "Sales")
+        if has("Product Name"):
+            plans["top_products"] = self._top(10)
+        if has("Profit"):
+            plans.update({
+                "category_profit": self._sum(["Category"], ["Profit"]),
+                "region_margin": self._sum(["Region"], ["Sales", "Profit"]),
+                "profit_histogram": lf.drop_nulls("Profit")
+                    .group_by(_bucket("Profit", engine.HISTOGRAM_BINS).alias("b")).agg(pl.len()),
+                "profit_range": lf.select(pl.col("Profit").min().alias("lo"),
+                                          pl.col("Profit").max().alias("hi")),
+            })
+            if has("Sub-Category"):
+                plans["subcategory"] = self._sum(["Sub-Category"], ["Sales", "Profit", "Orders"])
+        if has("Discount", "Profit"):
+            (xb, yb), (edges, _) = engine.DENSITY_BINS, engine.DISCOUNT_BANDS
+            band = pl.when(pl.col("Discount") <= edges[1]).then(0)
+            for i, hi in enumerate(edges[2:], 1):
+                band = band.when(pl.col("Discount") <= hi).then(i)
+            plans.update({
+                "discount_density": lf.drop_nulls(["Discount", "Profit"])
+                    .group_by(_bucket("Discount", xb).alias("x"), _bucket("Profit", yb).alias("y"))
+                    .agg(pl.len()),
+                "discount_bands": lf.filter(pl.col("Discount").is_between(edges[0], edges[-1]))
+                    .group_by(band.alias("band")).agg(pl.col("Profit").mean()).sort("band"),
+                "density_range": lf.drop_nulls(["Discount", "Profit"]).select(
+                    pl.col("Discount").min().alias("xlo"), pl.col("Discount").max().alias("xhi"),
+                    pl.col("Profit").min().alias("ylo"), pl.col("Profit").max().alias("yhi")),
+            })
+        return plans
+
+    @cached_property
+    def _batch(self):
+        """All plans collected at once — shared filter/YM scan, group-bys in parallel."""
+        plans = self._plans()
+        return dict(zip(plans, pl.collect_all(list(plans.values()))))
+
+    def _table(self, name, post=None):
+        def compute():
+            table = self._batch[name].to_pandas()
+            return post(table) if post else table
+        return self.memo(name, compute)
+
+    def kpis(self):
+        def compute():
+            r = self._batch["kpis"].row(0, named=True)
+            has = self.ds.has
+            sales, orders, profit = r["sales"] or 0, int(r["orders"]), r["profit"] or 0
+            n = int(r["sales_count"])
+            return engine.KPIs(sales, orders, sales / n if n else 0, profit,
+                               profit / sales * 100 if has("Profit") and sales else 0,
+                               r["quantity"], int(r["customers"]))
+        return self.memo("kpis", compute)
+
+    # ─── Sales trends ──────────────────────────────────────────
+    def yoy(self):
+        return self._table("yoy")
+
+    def category_monthly(self):
+        return self._table("category_monthly")
+
+    def weekday(self):
+        return self._table("weekday", lambda w: w.set_index("DayOfWeek").reindex(DAYS).reset_index())
+
+    def ship_mode(self):
+        return self._table("ship_mode")
+
+    # ─── Regional ──────────────────────────────────────────────
+    def region(self):
+        return self._table("region", lambda r: r.assign(
+            Share=(r["Sales"] / r["Sales"].sum() * 100).round(1)))
+
+    def state(self):
+        return self._table("state")
+
+    def region_category(self):
+        return self._table("region_category", lambda t: t.pivot(
+            index="Region", columns="Category", values="Sales").fillna(0))
+
+    # ─── Products ──────────────────────────────────────────────
+    def category_sales(self):
+        return self._table("category_sales")
+
+    def subcategory_sales(self):
+        return self._table("subcategory_sales")
+
+    def subcategory(self):
+        return self._table("subcategory", lambda b: b.assign(
+            Margin=(b["Profit"] / b["Sales"] * 100).round(1)))
+
+    def top_products(self, n=10):
+        short = lambda t: t.assign(Short=t["Product Name"].astype(str).str[:44])
+        if n != 10:
+            return self.memo(("top_products", n), lambda: short(self._top(n).collect().to_pandas()))
+        return self._table("top_products", short)
+
+    # ─── Profitability ─────────────────────────────────────────
+    def category_profit(self):
+        return self._table("category_profit")
+
+    def region_margin(self):
+        return self._table("region_margin", lambda r: r.assign(
+            Margin=(r["Profit"] / r["Sales"] * 100).round(2)))
+
+    def profit_histogram(self, bins=engine.HISTOGRAM_BINS):
+        if bins != engine.HISTOGRAM_BINS:
+            return super().profit_histogram(bins)
+
+        def post(r):
+            lo, hi = self._batch["profit_range"].row(0)
+            edges = _edges(lo, hi, bins)
+            counts = np.zeros(bins, "int64")
+            counts[r["b"].to_numpy("int64")] = r["len"].to_numpy("int64")
+            return pd.DataFrame({"left": edges[:-1], "right": edges[1:], "count": counts})
+        return self._table("profit_histogram", post)
+
+    def discount_density(self, bins=engine.DENSITY_BINS):
+        if tuple(bins) != engine.DENSITY_BINS:
+            return super().discount_density(bins)
+
+        def post(r):
+            xlo, xhi, ylo, yhi = self._batch["density_range"].row(0)
+            xe, ye = _edges(xlo, xhi, bins[0]), _edges(ylo, yhi, bins[1])
+            counts = np.zeros((bins[1], bins[0]), "int64")
+            counts[r["y"].to_numpy("int64"), r["x"].to_numpy("int64")] = r["len"].to_numpy("int64")
+            return pd.DataFrame(counts, index=(ye[:-1] + ye[1:]) / 2, columns=(xe[:-1] + xe[1:]) / 2)
+        return self._table("discount_density", post)
+
+    def discount_bands(self):
+        labels = engine.DISCOUNT_BANDS[1]
+        return self._table("discount_bands", lambda r: pd.DataFrame({
+            "Disc Range": pd.Categorical.from_codes(r["band"], labels, ordered=True),
+            "Avg Profit": r["Profit"]}))
@@ -0,0 +1,311 @@
+"""Row-partitioned aggregation across worker processes over memory-mapped columns.
+
+The columns behind the row-level tables (KPIs, top products, distributions,
+discount bands) are written once per dataset as .npy files under
+CACHE_DIR/columns/<digest>.<suffix>/ — dimensions as integer codes, dates as
+int64.
+Workers memory-map them, so only the filter spec and the partial results
+cross process boundaries: each worker scans one row range and returns
+mergeable partials (sums, per-code bincounts, distinct-customer bitmaps,
+min/max) that the parent adds up. Results match the single-process engine.
+
+A dump is deleted once its Dataset is evicted from the registry and no view
+still uses it. Dumps left behind by earlier processes are pruned, oldest first,
+while the directory holds more than SUPERSTORE_COLUMNS_MAX (default 8GB).
+
+Pool size: SUPERSTORE_WORKERS (default: every core); datasets below
+SUPERSTORE_PARALLEL_ROWS rows (default 2M) stay single-process.
+"""
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from . import engine, kernel
+from .cache import parse_bytes
+from .store import CACHE_DIR
+
+log = logging.getLogger(__name__)
+
+WORKERS = int(os.environ.get("SUPERSTORE_WORKERS") or os.cpu_count() or 1)
+# below this many rows the pool's round-trips cost more than a single-process scan
+MIN_ROWS = int(os.environ.get("SUPERSTORE_PARALLEL_ROWS") or 2_000_000)
+# ranges per worker — evens out workers that get slower (e.g. cold-cache) ranges
+SPLIT = 2
+COLUMNS_DIR = CACHE_DIR / "columns"
+MAX_DISK = parse_bytes(os.environ.get("SUPERSTORE_COLUMNS_MAX") or "8GB")
+
+MEASURES = ["Sales", "Profit", "Quantity", "Discount"]
+CODED = ["Region", "Category", "Segment", "Ship Mode", "Customer ID", "Product Name"]
+
+_pool = None
+_pool_lock = threading.Lock()
+_live = set()  # parent side: dump directories of Datasets still in use
+_opened = {}  # worker side: column directory → {column: memmap}
+
+
+def pool():
+    """The process-wide worker pool, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn/forkserver would re-run `__main__` — under Streamlit, the whole app
+            # script — in every worker; forked workers only run numpy over memmaps
+            method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(WORKERS, mp_context=mp.get_context(method))
+        return _pool
+
+
+def worth(ds):
+    """Whether `ds` is large enough (and held in full) for the pool to pay off."""
+    return WORKERS > 1 and not ds.streaming and len(ds.df) >= MIN_ROWS
+
+
+def _remove(root):
+    _live.discard(root)
+    shutil.rmtree(root, ignore_errors=True)
+
+
+def _du(path):
+    try:
+        return sum(f.stat().st_size for f in path.iterdir())
+    except OSError:  # removed meanwhile
+        return 0
+
+
+def prune(max_bytes=MAX_DISK):
+    """Delete dumps no live Dataset uses, oldest first, until the directory fits `max_bytes`."""
+    dirs = sorted((d for d in COLUMNS_DIR.iterdir() if d.is_dir()), key=lambda d: d.stat().st_mtime)
+    sizes = {d: _du(d) for d in dirs}
+    total = sum(sizes.values())
+    for d in dirs:
+        if total <= max_bytes:
+            break
+        if d not in _live:
+            shutil.rmtree(d, ignore_errors=True)
+            total -= sizes[d]
+    if total > max_bytes:
+        log.warning("column dumps in use take %d bytes, over SUPERSTORE_COLUMNS_MAX (%d)", total, max_bytes)
+
+
+class Dataset:
+    """An engine.Dataset whose row-level columns are shared with the worker pool."""
+
+    def __init__(self, ds, digest):
+        self.ds, self.n = ds, len(ds.df)
+        COLUMNS_DIR.mkdir(parents=True, exist_ok=True)
+        # one directory per instance: a dataset reloaded under the same digest
+        # never shares files with one whose dump is being deleted
+        self.root = Path(tempfile.mkdtemp(prefix=f"{digest}.", dir=COLUMNS_DIR))
+        _live.add(self.root)
+        self.close = weakref.finalize(self, _remove, self.root)
+        df, self.levels = ds.df, {}
+        if ds.has("Order Date"):
+            np.save(self.root / "Order Date.npy", df["Order Date"].to_numpy("datetime64[ns]").view("int64"))
+        for c in CODED:
+            if ds.has(c):
+                codes, self.levels[c] = kernel.codes(df[c])
+                np.save(self.root / f"{c}.npy", codes.astype("int32"))
+        for m in MEASURES:
+            if ds.has(m):
+                np.save(self.root / f"{m}.npy", df[m].to_numpy("float64"))
+        prune()
+
+    def view(self, date_range=None, selections=None, memo=None):
+        return View(self, date_range, selections, memo)
+
+
+# ─── Worker side ──────────────────────────────────────────────
+def _columns(root):
+    cols = _opened.get(root)
+    if cols is None:
+        for gone in [r for r in _opened if not os.path.isdir(r)]:
+            del _opened[gone]  # unmap deleted dumps so their disk space is released
+        cols = _opened[root] = {p.stem: np.load(p, mmap_mode="r") for p in Path(root).glob("*.npy")}
+    return cols
+
+
+def _rows(cols, lo, hi, spec):
+    """Selected row positions of [lo, hi) under the filter spec."""
+    dates, hits = spec
+    m = np.ones(hi - lo, bool)
+    if dates:
+        d = cols["Order Date"][lo:hi]
+        m &= (d >= dates[0]) & (d < dates[1])
+    for c, hit in hits.items():
+        m &= hit[cols[c][lo:hi]]  # code -1 lands on the trailing False slot
+    return lo + np.flatnonzero(m)
+
+
+def _range(*xs):
+    ok = np.logical_and.reduce([~np.isnan(x) for x in xs])
+    if not ok.any():
+        return None
+    return tuple(f(x[ok]) for x in xs for f in (np.min, np.max))
+
+
+def _scan(root, lo, hi, spec, sizes):
+    """Partial sums, bincounts and value ranges of one row range."""
+    cols = _columns(root)
+    rows = _rows(cols, lo, hi, spec)
+    get = lambda c: cols[c][rows]
+    out = {"orders": len(rows)}
+    for m in MEASURES:
+        if m in cols:
+            x = get(m)
+            out[m] = np.nansum(x)
+            if m == "Sales":
+                out["sales_count"] = np.count_nonzero(~np.isnan(x))
+    if "Customer ID" in cols:
+        c = get("Customer ID")
+        out["customers"] = np.bincount(c[c >= 0], minlength=sizes["Customer ID"]) > 0
+    if "Product Name" in cols:
+        c, s = get("Product Name"), get("Sales")
+        ok = c >= 0
+        out["product_sales"] = np.bincount(c[ok], np.nan_to_num(s[ok]), sizes["Product Name"])
+        out["product_rows"] = np.bincount(c[ok], minlength=sizes["Product Name"])
+    if "Profit" in cols:
+        p = get("Profit")
+        out["profit_range"] = _range(p)
+        if "Discount" in cols:
+            x = get("Discount")
+            out["pair_range"] = _range(x, p)
+            b = kernel.bins(x, engine.DISCOUNT_BANDS[0])
+            ok, n = b >= 0, len(engine.DISCOUNT_BANDS[1])
+            out["band_rows"] = np.bincount(b[ok], minlength=n)
+            ok &= ~np.isnan(p)
+            out["band_profit"] = np.bincount(b[ok], p[ok], n)
+            out["band_n"] = np.bincount(b[ok], minlength=n)
+    return out
+
+
+def _histograms(root, lo, hi, spec, profit_range, pair_range):
+    """Partial Profit histogram and Discount × Profit grid counts over fixed ranges."""
+    cols = _columns(root)
+    rows = _rows(cols, lo, hi, spec)
+    p = cols["Profit"][rows]
+    out = {"histogram": np.histogram(p[~np.isnan(p)], engine.HISTOGRAM_BINS, profit_range)[0]}
+    if "Discount" in cols:
+        x = cols["Discount"][rows]
+        ok = ~(np.isnan(x) | np.isnan(p))
+        out["density"] = np.histogram2d(x[ok], p[ok], engine.DENSITY_BINS, pair_range)[0]
+    return out
+
+
+def _merge(parts):
+    total = {}
+    for part in parts:
+        for k, v in part.items():
+            a = total.get(k)
+            if a is None or v is None:
+                total[k] = v if a is None else a
+            elif k.endswith("_range"):
+                total[k] = tuple(min(x, y) if i % 2 == 0 else max(x, y)
+                                 for i, (x, y) in enumerate(zip(a, v)))
+            else:
+                total[k] = a + v  # bool bitmaps: + is logical or
+    return total
+
+
+# ─── Parent side ──────────────────────────────────────────────
+class View(engine.View):
+    """engine.View with its row-level tables scanned by the worker pool."""
+
+    def __init__(self, par, date_range=None, selections=None, memo=None):
+        super().__init__(par.ds, date_range, selections, memo)
+        self.par = par
+        dates, hits = None, {}
+        if self.date_range and self.ds.has("Order Date"):
+            lo, hi = (np.datetime64(d, "D") for d in self.date_range)
+            dates = (lo.astype("datetime64[ns]").view("int64").item(),
+                     (hi + 1).astype("datetime64[ns]").view("int64").item())
+        for col, values in self.selections.items():
+            if values and col in par.levels:
+                levels = par.levels[col]
+                hit = np.zeros(len(levels) + 1, bool)
+                hit[levels.get_indexer(list(values))] = True
+                hit[-1] = False
+                hits[col] = hit
+        self.spec = (dates, hits)
+
+    def _map(self, fn, *args):
+        bounds = np.linspace(0, self.par.n, WORKERS * SPLIT + 1).astype("int64")
+        k = len(bounds) - 1
+        return _merge(pool().map(fn, [str(self.par.root)] * k, bounds[:-1], bounds[1:],
+                                 [self.spec] * k, *([a] * k for a in args)))
+
+    @cached_property
+    def _scan(self):
+        return self._map(_scan, {c: len(v) for c, v in self.par.levels.items()})
+
+    @cached_property
+    def _histograms(self):
+        s = self._scan
+        pr, xr = s.get("profit_range"), s.get("pair_range")
+        return self._map(_histograms, pr, xr and (xr[:2], xr[2:]))
+
+    def kpis(self):
+        def compute():
+            s, has = self._scan, self.ds.has
+            sales, orders, n = s["Sales"], s["orders"], s["sales_count"]
+            profit = s["Profit"] if has("Profit") else 0
+            quantity = None
+            if has("Quantity"):
+                quantity = s["Quantity"]
+                if pd.api.types.is_integer_dtype(self.ds.df["Quantity"].dtype):
+                    quantity = int(round(quantity))
+            return engine.KPIs(sales, orders, sales / n if n else 0, profit,
+                               profit / sales * 100 if has("Profit") and sales else 0, quantity,
+                               int(np.count_nonzero(s["customers"])) if has("Customer ID") else orders)
+        return self.memo("kpis", compute)
+
+    def top_products(self, n=10):
+        def compute():
+            s, levels = self._scan, self.par.levels["Product Name"]
+            hit = np.flatnonzero(s["product_rows"])
+            return pd.DataFrame({"Product Name": levels.take(hit), "Sales": s["product_sales"][hit]}) \
+                .sort_values("Sales", ascending=False).head(n).reset_index(drop=True) \
+                .assign(Short=lambda t: t["Product Name"].astype(str).str[:44])
+        return self.memo("top_products", compute)
+
+    def profit_histogram(self, bins=engine.HISTOGRAM_BINS):
+        if bins != engine.HISTOGRAM_BINS:
+            return super().profit_histogram(bins)
+
+        def compute():
+            edges = np.histogram_bin_edges([], bins, self._scan.get("profit_range"))
+            return pd.DataFrame({"left": edges[:-1], "right": edges[1:],
+                                 "count": self._histograms["histogram"]})
+        return self.memo("profit_histogram", compute)
+
+    def discount_density(self, bins=engine.DENSITY_BINS):
+        if tuple(bins) != engine.DENSITY_BINS:
+            return super().discount_density(bins)
+
+        def compute():
+            r = self._scan.get("pair_range")
+            xe = np.histogram_bin_edges([], bins[0], r and r[:2])
+            ye = np.histogram_bin_edges([], bins[1], r and r[2:])
+            return pd.DataFrame(self._histograms["density"].T.astype("int64"),
+                                index=(ye[:-1] + ye[1:]) / 2, columns=(xe[:-1] + xe[1:]) / 2)
+        return self.memo("discount_density", compute)
+
+    def discount_bands(self):
+        def compute():
+            s = self._scan
+            hit = np.flatnonzero(s["band_rows"])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                avg = s["band_profit"][hit] / s["band_n"][hit]
+            return pd.DataFrame({
+                "Disc Range": pd.Categorical.from_codes(hit, engine.DISCOUNT_BANDS[1], ordered=True),
+                "Avg Profit": avg})
+        return self.memo("discount_bands", compute)
@@ -0,0 +1,118 @@
+"""Date-partitioned dataset directory — one sub-directory per order month.
+
+    root/year=2017/month=03/<extract digest>.arrow
+    root/undated/<extract digest>.arrow        (rows without an Order Date)
+
+`add` splits a CSV extract by Order Date month and writes one Arrow file per
+month, so monthly extracts are appended as new files and re-adding the same
+extract only rewrites its own files. `files(root, start, end)` prunes to the
+months overlapping a date range and `read` memory-maps just those.
+
+    python -m superstore.partitions data/superstore extract-2017-03.csv …
+"""
+import argparse
+import hashlib
+import re
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from . import store
+from .ingest import memory_bytes, month, read_csv
+
+UNDATED = "undated"
+_MONTH_DIR = re.compile(r"year=(\d{4})/month=(\d{2})$")
+
+
+def add(f, root, digest=None):
+    """Partition one CSV extract into `root` → paths written."""
+    root = Path(root)
+    digest = digest or store.content_hash(f)
+    df, mem = read_csv(f)
+    raw = mem["raw_bytes"] / max(len(df), 1)
+    written = []
+    if "Order Date" in df.columns:
+        key = month(df)
+        groups = [(root / f"year={m.year}/month={m.month:02d}", part)
+                  for m, part in df.groupby(key, sort=True, observed=True)]
+        if key.isna().any():
+            groups.append((root / UNDATED, df[key.isna()]))
+    else:
+        groups = [(root / UNDATED, df)]
+    for folder, part in groups:
+        path = folder / f"{digest}.arrow"
+        store.write(part.reset_index(drop=True), {"raw_bytes": int(raw * len(part))}, path)
+        written.append(path)
+    return written
+
+
+def months(root):
+    """{month start: [files]} for every month partition under `root`, in date order."""
+    found = {}
+    for path in sorted(Path(root).glob("year=*/month=*/*.arrow")):
+        m = _MONTH_DIR.search(path.parent.as_posix())
+        if m:
+            found.setdefault(pd.Timestamp(int(m[1]), int(m[2]), 1), []).append(path)
+    return dict(sorted(found.items()))
+
+
+def bounds(root):
+    """(first day, last day) covered by the month partitions, or None when there are none."""
+    ms = list(months(root))
+    if not ms:
+        return None
+    return ms[0].date(), (ms[-1] + pd.offsets.MonthEnd(0)).date()
+
+
+def files(root, start=None, end=None):
+    """Files of the months overlapping the inclusive [start, end] date range.
+
+    Without a range every partition is read, undated rows included.
+    """
+    if start is None or end is None:
+        undated = sorted((Path(root) / UNDATED).glob("*.arrow"))
+        return [p for ps in months(root).values() for p in ps] + undated
+    lo = pd.Timestamp(start).to_period("M").to_timestamp()
+    hi = pd.Timestamp(end)
+    return [p for m, ps in months(root).items() if lo <= m <= hi for p in ps]
+
+
+def fingerprint(paths):
+    """Digest of a file set — names, sizes and mtimes; changes when a partition is rewritten."""
+    h = hashlib.blake2b(digest_size=16)
+    for p in paths:
+        st = Path(p).stat()
+        h.update(f"{Path(p).as_posix()}|{st.st_size}|{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()
+
+
+def read(paths):
+    """Memory-map and concatenate partition files → (DataFrame, memory report)."""
+    tables = [pa.ipc.open_file(pa.memory_map(str(p))).read_all() for p in paths]
+    raw = sum(store.meta(t).get("raw_bytes", 0) for t in tables)
+    # extracts may have been typed differently (int8 vs int16, dictionaries per file)
+    table = pa.concat_tables([t.replace_schema_metadata(None) for t in tables],
+                             promote_options="permissive").unify_dictionaries()
+    df = table.to_pandas(split_blocks=True)
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].cat.reorder_categories(sorted(df[c].cat.categories))
+    mem = {"bytes": memory_bytes(df)}
+    mem["raw_bytes"] = raw or mem["bytes"]
+    return df, mem
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Add CSV extracts to a month-partitioned dataset.")
+    ap.add_argument("root", help="dataset directory (created if missing)")
+    ap.add_argument("csv", nargs="+")
+    args = ap.parse_args(argv)
+    for csv in args.csv:
+        with open(csv, "rb") as f:
+            written = add(f, args.root)
+        print(f"{csv}: {len(written)} partitions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Per-rerun stage timings (wall time + process RSS delta), optionally logged as JSON lines."""
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+# append one JSON object per recorded stage here when set
+LOG_PATH = os.environ.get("SUPERSTORE_PERF_LOG")
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_log_lock = threading.Lock()
+
+
+def rss():
+    """Resident set size of this process in bytes (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def new_session():
+    return uuid.uuid4().hex[:8]
+
+
+class Trace:
+    """Stage records for one script run.
+
+    `stage(name)` times a block; `lap(name)` charges the time since the previous
+    record to `name` (e.g. building a figure between its aggregation and its
+    render). RSS is process-wide, so deltas include other sessions' allocations.
+    """
+
+    def __init__(self, session, run):
+        self.session, self.run = session, run
+        self.started = time.time()
+        self.records = []
+        self._t0 = self._mark = time.perf_counter()
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name, **extra):
+        t0, m0 = time.perf_counter(), rss()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self._add(name, t0, m0, extra)
+
+    def lap(self, name, **extra):
+        self._add(name, self._mark, None, extra)
+
+    def _add(self, name, t0, m0, extra):
+        now, m1 = time.perf_counter(), rss()
+        self.records.append({
+            "stage": name, "depth": self._depth,
+            "start_ms": round((t0 - self._t0) * 1000, 3), "ms": round((now - t0) * 1000, 3),
+            "rss_delta": m1 - m0 if m0 is not None and m1 is not None else None, **extra})
+        self._mark = now
+
+    def total_ms(self):
+        return round((time.perf_counter() - self._t0) * 1000, 3)
+
+    def rows(self):
+        """Records in start order (outer stages before the stages they contain)."""
+        return sorted(self.records, key=lambda r: (r["start_ms"], r["depth"]))
+
+    def write(self, path=None):
+        """Append this run's records as JSON lines to `path` (default LOG_PATH)."""
+        path = path or LOG_PATH
+        if not path:
+            return
+        head = {"ts": self.started, "session": self.session, "run": self.run}
+        lines = [json.dumps({**head, **r}) for r in self.rows()]
+        lines.append(json.dumps({**head, "stage": "total", "depth": 0, "ms": self.total_ms(),
+                                 "rss": rss()}))
+        with _log_lock, open(path, "a") as f:
+            f.write("\n".join(lines) + "\n")
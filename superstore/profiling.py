@@ -0,0 +1,114 @@
+"""Dataset profile computed once at ingest.
+
+Per-column dtype / nulls / memory, plus numeric moments kept per filter
+partition (month × Region × Category × Segment × Ship Mode) so that any
+sidebar selection merges a few thousand partitions instead of rescanning
+rows. Quantiles are approximated from a uniform sample of the selection.
+"""
+import numpy as np
+import pandas as pd
+
+from .ingest import month
+
+PARTITION = ["Region", "Category", "Segment", "Ship Mode"]
+QUANTILES = [0.25, 0.5, 0.75]
+QUANTILE_SAMPLE = 20_000
+_AGG = {"n": "sum", "s1": "sum", "s2": "sum", "min": "min", "max": "max"}
+
+
+def columns(df):
+    """dtype, null count and memory for every column — one pass each."""
+    return pd.DataFrame({
+        "dtype":  df.dtypes.astype(str),
+        "nulls":  df.isna().sum(),
+        "memory": df.memory_usage(index=False, deep=True),
+    })
+
+
+def shifts(df, n=10_000):
+    """Per numeric column reference value; moments are summed around it to avoid cancellation."""
+    head = df.select_dtypes(include=np.number).head(n)
+    return {c: float(v) if pd.notna(v) else 0.0 for c, v in head.median().items()}
+
+
+def partition_stats(rows, shift):
+    """One row per filter partition: Rows, Nulls and n/s1/s2/min/max per numeric column.
+
+    s1/s2 are sums of (x - shift) and its square — additive, so partitions
+    merge by plain sums.
+    """
+    keys = ([month(rows)] if "Order Date" in rows.columns else []) + \
+           [rows[c] for c in PARTITION if c in rows.columns]
+    if not keys:
+        keys = [pd.Series(0, index=rows.index, name="_all")]
+    key_frame = pd.concat(keys, axis=1)
+    g = key_frame.groupby(list(key_frame.columns), observed=True, dropna=False, sort=False)
+    codes = g.ngroup().to_numpy()
+    size = int(codes.max()) + 1 if len(codes) else 0
+    out = key_frame.iloc[np.unique(codes, return_index=True)[1]].reset_index(drop=True)
+    out["Rows"] = np.bincount(codes, minlength=size)
+    out["Nulls"] = np.bincount(codes, weights=rows.isna().sum(axis=1).to_numpy(), minlength=size)
+    for c, k in shift.items():
+        x = rows[c].to_numpy("float64", na_value=np.nan) - k
+        ok = ~np.isnan(x)
+        out[f"{c}|n"] = np.bincount(codes[ok], minlength=size)
+        out[f"{c}|s1"] = np.bincount(codes[ok], weights=x[ok], minlength=size)
+        out[f"{c}|s2"] = np.bincount(codes[ok], weights=x[ok] ** 2, minlength=size)
+        xs = pd.Series(rows[c].to_numpy("float64", na_value=np.nan))
+        grouped = xs.groupby(codes)
+        out[f"{c}|min"] = grouped.min().reindex(range(size)).to_numpy()
+        out[f"{c}|max"] = grouped.max().reindex(range(size)).to_numpy()
+    return out
+
+
+def merge(parts):
+    """Combine partition-stat frames built with the same shifts (e.g. per chunk)."""
+    parts = [p for p in parts if p is not None]
+    if len(parts) == 1:
+        return parts[0]
+    both = pd.concat(parts, ignore_index=True)
+    stat = [c for c in both.columns if "|" in c or c in ("Rows", "Nulls")]
+    keys = [c for c in both.columns if c not in stat]
+    spec = {c: _AGG.get(c.rsplit("|", 1)[-1], "sum") for c in stat}
+    return both.groupby(keys, observed=True, dropna=False, sort=False).agg(spec).reset_index()
+
+
+def summarize(stats, shift):
+    """Merged partitions → describe()-shaped frame (count, mean, std, min, max)."""
+    rows = {}
+    for c, k in shift.items():
+        n, s1, s2 = (stats[f"{c}|{m}"].sum() for m in ("n", "s1", "s2"))
+        rows[c] = {
+            "count": n,
+            "mean":  k + s1 / n if n else np.nan,
+            "std":   np.sqrt(max(s2 - s1 * s1 / n, 0) / (n - 1)) if n > 1 else np.nan,
+            "min":   stats[f"{c}|min"].min(),
+            "max":   stats[f"{c}|max"].max(),
+        }
+    return pd.DataFrame(rows)
+
+
+def sample_positions(order, mask, k=QUANTILE_SAMPLE):
+    """First `k` selected rows in a fixed random `order` — a uniform sample of the selection.
+
+    Walks `order` in growing steps, so a selective filter reads ~k / selectivity
+    entries rather than the whole mask.
+    """
+    if mask is None:
+        return order[:k]
+    found, taken, start, step = [], 0, 0, k
+    while start < len(order) and taken < k:
+        block = order[start:start + step]
+        hit = block[mask[block]]
+        found.append(hit)
+        taken += len(hit)
+        start, step = start + step, step * 2
+    return np.concatenate(found)[:k] if found else order[:0]
+
+
+def describe(stats, shift, sample):
+    """describe()-style table: exact moments from `stats`, quantiles from `sample` rows."""
+    out = summarize(stats, shift)
+    q = sample[list(shift)].quantile(QUANTILES)
+    q.index = [f"{p:.0%}" for p in QUANTILES]
+    return pd.concat([out.loc[["count", "mean", "std", "min"]], q, out.loc[["max"]]])
@@ -0,0 +1,138 @@
+"""Multi-resolution time pyramid — Sales / Profit / Orders per day, week, month, quarter, year.
+
+The day level holds one row per day × filter-dimension cell; each coarser
+level is rolled up from it once per dataset. A trend over a date range
+reads its whole periods from its own level and only the partial periods at
+the two ends from the days, so it costs a few thousand cells whatever the
+row count. Day tables are additive: chunked (streaming) ingest merges one
+per chunk and stays exact to the day.
+"""
+import numpy as np
+import pandas as pd
+
+from . import kernel
+from .filters import FILTER_DIMS, FilterIndex, select
+
+# level → chart label, finest first
+LEVELS = {"Day": "Daily", "Week": "Weekly", "Month": "Monthly", "Quarter": "Quarterly", "Year": "Yearly"}
+# average days per period — sizes a span in buckets
+_DAYS = {"Day": 1, "Week": 7, "Month": 30.44, "Quarter": 91.31, "Year": 365.25}
+# the automatic level is the finest that shows a span in at most this many buckets
+MAX_BUCKETS = 180
+
+MEASURES = ["Sales", "Profit"]
+
+
+def _floor(d, level):
+    """datetime64[D] → first day of its `level` period (weeks start on Monday)."""
+    d = np.asarray(d, "datetime64[D]")
+    if level == "Week":
+        return d - ((d.view("int64") + 3) % 7).astype("timedelta64[D]")  # 1970-01-01: a Thursday
+    if level == "Quarter":
+        m = d.astype("datetime64[M]")
+        return (m - m.view("int64") % 3).astype("datetime64[D]")
+    unit = {"Day": "D", "Month": "M", "Year": "Y"}[level]
+    return d.astype(f"datetime64[{unit}]").astype("datetime64[D]")
+
+
+def _next(start, level):
+    """First day of the `level` period after the one starting on `start`."""
+    if level in ("Day", "Week"):
+        return start + _DAYS[level]
+    unit, n = ("Y", 1) if level == "Year" else ("M", 3 if level == "Quarter" else 1)
+    return (np.asarray(start, "datetime64[D]").astype(f"datetime64[{unit}]") + n).astype("datetime64[D]")
+
+
+def period(day, level):
+    """Inclusive (first, last) date of the `level` period containing `day`."""
+    start = _floor(np.datetime64(pd.Timestamp(day).date(), "D"), level)
+    return start.item(), (_next(start, level) - 1).item()
+
+
+def split(date_range, level):
+    """Split an inclusive date range into whole `level` periods and partial edges.
+
+    As cube.month_split: `whole` is an inclusive (first, last) pair covering
+    complete periods only, or None; `edges` the leftover inclusive day ranges.
+    """
+    start, end = (np.datetime64(d, "D") for d in date_range)
+    stop = end + 1
+    p0 = _floor(start, level)
+    p0 = p0 if p0 == start else _next(p0, level)
+    p1 = _floor(stop, level)
+    if p0 >= p1:
+        return None, [(start.item(), end.item())]
+    edges = [(a.item(), (b - 1).item()) for a, b in [(start, p0), (p1, stop)] if a < b]
+    return (p0.item(), (p1 - 1).item()), edges
+
+
+def auto(start, end, max_buckets=MAX_BUCKETS):
+    """Finest level showing the inclusive span `start`–`end` in at most `max_buckets` periods."""
+    days = (end - start).days + 1
+    return next((lv for lv, d in _DAYS.items() if days / d <= max_buckets), "Year")
+
+
+def intersect(a, b):
+    """Overlap of two inclusive date ranges (either may be None: unbounded)."""
+    if not a or not b:
+        return a or b or None
+    return max(a[0], b[0]), min(a[1], b[1])
+
+
+def _sum(table):
+    keys = [c for c in table.columns if c not in MEASURES and c != "Orders"]
+    return table.groupby(keys, observed=True, dropna=False, sort=False).sum().reset_index()
+
+
+def days(rows):
+    """Row-level frame → day level: Sales / Profit sums + Orders per day × filter dims."""
+    d = rows["Order Date"]
+    if d.isna().any():
+        rows, d = rows[d.notna()], d[d.notna()]
+    keys = [pd.Series(d.values.astype("datetime64[D]").astype("datetime64[ns]"),
+                      index=rows.index, name="Period")]
+    keys += [rows[c] for c in FILTER_DIMS if c in rows.columns]
+    vals = rows[[m for m in MEASURES if m in rows.columns]].astype("float64")
+    g = vals.groupby(keys, observed=True, dropna=False, sort=False)
+    out = g.sum()
+    out["Orders"] = g.size()
+    return out.reset_index()
+
+
+def merge(parts):
+    """Combine partial day tables (e.g. one per chunk) into one."""
+    parts = [p for p in parts if p is not None]
+    if len(parts) == 1:
+        return parts[0]
+    return _sum(pd.concat(parts, ignore_index=True))
+
+
+class Pyramid:
+    """Every level rolled up from one day table, each with its own filter index."""
+
+    def __init__(self, days):
+        self.tables, self.ix = {}, {}
+        for level in LEVELS:
+            table = days if level == "Day" else _sum(days.assign(
+                Period=_floor(days["Period"].to_numpy(), level).astype("datetime64[ns]")))
+            self.tables[level] = table
+            self.ix[level] = FilterIndex(table, "Period")
+        d = days["Period"]
+        self.bounds = (d.min().date(), d.max().date()) if len(d) else None
+
+    @property
+    def nbytes(self):
+        return sum(int(t.memory_usage(deep=True).sum()) + self.ix[lv].nbytes
+                   for lv, t in self.tables.items())
+
+    def trend(self, level, date_range=None, selections=None):
+        """Sales / Profit / Orders per `level` period of the rows in `date_range` under `selections`."""
+        whole, edges = split(date_range, level) if date_range else (None, [])
+        parts = []
+        for e in edges:
+            t = select(self.tables["Day"], self.ix["Day"].mask(e, selections))
+            parts.append(t.assign(Period=_floor(t["Period"].to_numpy(), level).astype("datetime64[ns]")))
+        if whole or not edges:
+            parts.append(select(self.tables[level], self.ix[level].mask(whole, selections)))
+        frame = pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+        return kernel.group(frame, "Period", [m for m in (*MEASURES, "Orders") if m in frame.columns])
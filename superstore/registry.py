@@ -0,0 +1,62 @@
+"""Process-wide registry of loaded datasets, shared read-only by every session.
+
+The first session to open a dataset (keyed by content digest + load mode)
+loads it — sessions opening the same one meanwhile wait for that load — and
+every later session and rerun gets the same engine.Dataset: one row frame,
+cube (with its YM / DayOfWeek keys) and set of filter indexes per distinct
+dataset, however many analysts have it open. Sessions hold only views (row
+masks) over it, so entries must never be mutated.
+
+Entries are charged their resident bytes and evicted like any LRUCache entry
+(idle TTL, shared memory Budget); an evicted dataset is reloaded from the
+on-disk store the next time it is opened.
+"""
+import threading
+
+from .cache import LRUCache, _MISS
+
+
+class Registry(LRUCache):
+    """`get(key, load, session)` → the dataset under `key`, loaded once by `load()`."""
+
+    def __init__(self, maxsize=16, ttl=None, name="datasets"):
+        super().__init__(maxsize, ttl, name)
+        self._loading = {}  # key → lock held while its first session loads it
+        self._sessions = {}
+        self.loads = 0
+
+    def get(self, key, load, session=None):
+        value = self._lookup(key)
+        if value is _MISS:
+            with self._lock:
+                gate = self._loading.setdefault(key, threading.Lock())
+            with gate:
+                value = self._lookup(key, count=False)
+                if value is _MISS:
+                    value = load()
+                    self.put(key, value)
+                    self.loads += 1
+            with self._lock:
+                self._loading.pop(key, None)
+        if session:
+            with self._lock:
+                if key in self._data:
+                    self._sessions.setdefault(key, set()).add(session)
+        return value
+
+    def _drop(self, key, reason=None):
+        super()._drop(key, reason)
+        self._sessions.pop(key, None)
+
+    def entries(self):
+        """One row per held dataset, least recently used first."""
+        with self._lock:
+            return [{"key": "/".join(map(str, k)) if isinstance(k, tuple) else str(k),
+                     "rows": _rows(e[0]), "bytes": e[1], "sessions": len(self._sessions.get(k, ())),
+                     "used": e[2]}
+                    for k, e in self._data.items()]
+
+
+def _rows(value):
+    ds = getattr(value, "ds", value)  # backend wrappers hold the engine dataset
+    return len(ds.df) if hasattr(ds, "df") else None
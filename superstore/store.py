@@ -0,0 +1,72 @@
+"""Content-addressed on-disk cache of parsed datasets (Arrow IPC, memory-mapped)."""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pyarrow as pa
+
+from .ingest import memory_bytes, read_csv
+
+CACHE_DIR = Path(os.environ.get("SUPERSTORE_CACHE_DIR",
+                                Path.home() / ".cache" / "superstore-analytics"))
+# bump when ingest typing changes so stale files are not reused
+FORMAT = 1
+_META_KEY = b"superstore"
+
+
+def content_hash(f, chunk=1 << 22):
+    """Hex digest of a file-like object's bytes; leaves the stream rewound."""
+    h = hashlib.blake2b(digest_size=16)
+    f.seek(0)
+    for block in iter(lambda: f.read(chunk), b""):
+        h.update(block)
+    f.seek(0)
+    return h.hexdigest()
+
+
+def cache_path(digest):
+    return CACHE_DIR / f"{digest}.v{FORMAT}.arrow"
+
+
+def write(df, mem, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    meta = {**(table.schema.metadata or {}), _META_KEY: json.dumps(mem).encode()}
+    table = table.replace_schema_metadata(meta)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp, path)  # atomic: readers never see a half-written file
+
+
+def meta(table):
+    """The memory report written alongside a cached table."""
+    return json.loads((table.schema.metadata or {}).get(_META_KEY, b"{}"))
+
+
+def read(path):
+    """Memory-map a cached dataset → (DataFrame, memory report)."""
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    mem = meta(table)
+    df = table.to_pandas(split_blocks=True)
+    mem["bytes"] = memory_bytes(df)
+    mem.setdefault("raw_bytes", mem["bytes"])
+    return df, mem
+
+
+def load(f, digest=None, reader=read_csv):
+    """Parse `f` once per distinct content; later calls reload from disk."""
+    path = cache_path(digest or content_hash(f))
+    if path.exists():
+        try:
+            return read(path)
+        except (OSError, pa.ArrowInvalid):
+            pass  # truncated/corrupt entry — fall through and rebuild it
+    df, mem = reader(f)
+    try:
+        write(df, mem, path)
+    except OSError:
+        pass  # cache is best effort (read-only disk, quota…)
+    return df, mem
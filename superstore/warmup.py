@@ -0,0 +1,57 @@
+"""Background precompute of the likely first clicks after a dataset loads.
+
+A daemon thread fills the aggregation cache with the KPIs and every chart
+table for the default filter state (everything selected) and for each single
+Region / single Category selection, while the user is still reading the KPI
+row. It is best effort: anything not warmed yet is computed on demand.
+"""
+import threading
+import time
+
+from .filters import FILTER_DIMS
+
+
+def states(ds, date_range=None, dims=("Region", "Category")):
+    """(date_range, selections) of the default state, then one per single value of `dims`."""
+    base = {c: ds.options(c) if ds.has(c) else None for c in FILTER_DIMS}
+    out = [(date_range, base)]
+    for dim in dims:
+        if ds.has(dim):
+            out += [(date_range, {**base, dim: [v]}) for v in base[dim]]
+    return out
+
+
+class Warmup:
+    """Computes every table of `source`'s view of each state into `cache`.
+
+    `key(date_range, selections)` gives the cache key prefix the app uses for
+    that state, so its own lookups hit the warmed entries.
+    """
+
+    def __init__(self, source, cache, key, states):
+        self.source, self.cache, self.key, self.states = source, cache, key, states
+        self.done, self.error, self.seconds = 0, None, None
+        self.thread = threading.Thread(target=self._run, name="superstore-warmup", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def _run(self):
+        t0 = time.perf_counter()
+        try:
+            for date_range, selections in self.states:
+                sig = self.key(date_range, selections)
+                view = self.source.view(date_range, selections, memo=lambda name, compute, sig=sig:
+                                        self.cache.get((*sig, name), compute))
+                view.kpis()
+                view.aggregates()
+                self.done += 1
+        except Exception as e:  # never take the app down from a background thread
+            self.error = repr(e)
+        self.seconds = round(time.perf_counter() - t0, 2)
+        self.source = None  # don't keep an evicted dataset (and its column dump) alive
+
+    def status(self):
+        return {"states": f"{self.done}/{len(self.states)}", "running": self.thread.is_alive(),
+                "seconds": self.seconds, "error": self.error}
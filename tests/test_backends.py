@@ -0,0 +1,53 @@
+import datetime as dt
+import importlib
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.generate import chunk
+from superstore import cube as cubes, engine, parallel
+from superstore.ingest import read_csv
+
+CASES = [
+    (None, None),
+    ((dt.date(2015, 3, 5), dt.date(2016, 2, 10)), {"Region": ["West", "East"], "Category": ["Technology"]}),
+    ((dt.date(2017, 6, 1), dt.date(2017, 6, 30)), {"Segment": ["Consumer"]}),
+]
+
+
+@pytest.fixture(scope="module")
+def ds():
+    rng = np.random.default_rng(2)
+    rows = chunk(rng, 3000, pd.Timestamp("2014-01-01"), 4 * 365, 1)
+    for col in ["Sales", "Profit", "Region", "Order Date"]:
+        rows.loc[rng.random(len(rows)) < .03, col] = None
+    df, mem = read_csv(io.StringIO(rows.to_csv(index=False)))
+    return engine.Dataset(df, cubes.aggregate(df), mem)
+
+
+@pytest.fixture(params=["duck", "lazy", "parallel"])
+def backend(request, ds, tmp_path, monkeypatch):
+    if request.param == "parallel":
+        monkeypatch.setattr(parallel, "COLUMNS_DIR", tmp_path)
+        return parallel.Dataset(ds, "test")
+    pytest.importorskip({"duck": "duckdb", "lazy": "polars"}[request.param])
+    return importlib.import_module(f"superstore.{request.param}").Dataset(ds)
+
+
+@pytest.mark.parametrize("date_range, selections", CASES)
+def test_backend_matches_pandas_view(ds, backend, date_range, selections):
+    want, got = ds.view(date_range, selections), backend.view(date_range, selections)
+    for name, a, b in zip(engine.KPIs._fields, want.kpis(), got.kpis()):
+        assert b == pytest.approx(a, rel=1e-9), name
+    for name, table in want.aggregates().items():
+        other = got.aggregates()[name]
+        if name == "discount_sample":  # a random sample: same size only
+            assert len(other) == len(table)
+            continue
+        keep_index = name in ("region_category", "discount_density")
+        pd.testing.assert_frame_equal(other if keep_index else other.reset_index(drop=True),
+                                      table if keep_index else table.reset_index(drop=True),
+                                      check_dtype=False, check_categorical=False, check_index_type=False,
+                                      check_column_type=False, check_names=False, rtol=1e-9, obj=name)
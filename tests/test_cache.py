@@ -0,0 +1,122 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from superstore.cache import Budget, LRUCache, parse_bytes
+from superstore.registry import Registry
+
+
+class Blob:
+    """A value charged exactly `nbytes`."""
+
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def test_parse_bytes():
+    assert parse_bytes("512MB") == 512 * 1024**2
+    assert parse_bytes("1.5 G") == int(1.5 * 1024**3)
+    assert parse_bytes(4096) == 4096
+    with pytest.raises(ValueError):
+        parse_bytes("lots")
+
+
+def test_lru_order():
+    c = LRUCache(maxsize=2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a", lambda: pytest.fail("a was evicted")) == 1  # a is now most recent
+    c.put("c", 3)
+    assert list(c._data) == ["a", "c"]
+    assert c.evicted["lru"] == 1
+    assert (c.hits, c.misses) == (1, 0)
+
+
+def test_get_computes_once():
+    c, calls = LRUCache(), []
+    for _ in range(3):
+        assert c.get("k", lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1
+    assert (c.hits, c.misses) == (2, 1)
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    c = LRUCache(ttl=60)
+    c.put("old", 1)
+    now[0] += 30
+    c.put("new", 2)
+    now[0] += 40  # old idle 70s, new 40s
+    c.expire()
+    assert list(c._data) == ["new"]
+    assert c.evicted["ttl"] == 1
+    now[0] += 61
+    assert c.get("new", lambda: 3) == 3  # expired on lookup → recomputed
+    assert c.evicted["ttl"] == 2
+
+
+def test_budget_evicts_lru_across_caches():
+    budget = Budget(max_bytes=1000)
+    a, b = budget.add(LRUCache(name="a")), budget.add(LRUCache(name="b"))
+    a.put("a1", Blob(400))
+    b.put("b1", Blob(400))
+    a.put("a2", Blob(100))
+    b.put("b2", Blob(300))  # 1200 > 1000: a1 is the globally least recently used
+    assert "a1" not in a._data and list(b._data) == ["b1", "b2"]
+    assert a.evicted["budget"] == 1 and budget.used() == 800
+
+
+def test_oversized_entry_is_kept_not_thrashed():
+    budget = Budget(max_bytes=1000)
+    reg = budget.add(Registry())
+    aggs = budget.add(LRUCache(name="aggregates"))
+    for _ in range(3):
+        assert reg.get("big", lambda: Blob(2000)).nbytes == 2000
+    assert reg.loads == 1 and reg.evicted["budget"] == 0
+    assert budget.oversized == 1
+    # later entries of other caches evict each other, never the dataset in use
+    for i in range(5):
+        aggs.put(i, Blob(100))
+    assert "big" in reg._data and reg.loads == 1
+    assert len(aggs._data) == 1
+
+
+def test_oversized_entry_evictable_once_not_in_use():
+    budget = Budget(max_bytes=1000)
+    reg = budget.add(Registry())
+    reg.get("big", lambda: Blob(2000))
+    reg.get("small", lambda: Blob(100))  # "big" is no longer the one in use
+    assert list(reg._data) == ["small"]
+    assert reg.evicted["budget"] == 1
+
+
+def test_registry_loads_once_across_sessions():
+    reg, started = Registry(), threading.Event()
+
+    def load():
+        started.set()
+        time.sleep(0.05)  # sessions arriving meanwhile wait for this load
+        return np.arange(10)
+
+    out = []
+    threads = [threading.Thread(target=lambda s=s: out.append(reg.get("ds", load, session=s)))
+               for s in ("s1", "s2", "s3")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert reg.loads == 1
+    assert all(v is out[0] for v in out)
+    [entry] = reg.entries()
+    assert entry["sessions"] == 3
+
+
+def test_registry_reloads_after_eviction():
+    reg = Registry(maxsize=1)
+    reg.get("a", lambda: 1)
+    reg.get("b", lambda: 2)
+    assert reg.get("a", lambda: 3) == 3
+    assert reg.loads == 3
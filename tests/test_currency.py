@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from superstore import currency
+
+EDGES = [0, 0.004, 0.005, 999.99, 999.995, 1_000, 999_999.99, 1_000_000, 1_00_000, 1_00_00_000,
+         -5, -1_500, -2_000_000, 123_456_789.123]
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(9)
+    return np.concatenate([EDGES, rng.lognormal(8, 4, 2000), -rng.lognormal(6, 3, 200)])
+
+
+@pytest.mark.parametrize("rate", [None, 83.0, 83.25])
+def test_labels_match_fmt(values, rate):
+    assert currency.labels(values, rate) == [currency.fmt(v, rate) for v in values]
+
+
+def test_labels_of_missing_and_empty():
+    assert currency.labels([np.nan, 1_500.0]) == [currency.fmt(np.nan), "$1.5K"]
+    assert currency.labels([]) == []
+    assert currency.labels(np.array([2, 3], dtype="int64"), 83.0) == ["₹166", "₹249"]
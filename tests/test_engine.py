@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from superstore import cube as cubes, engine
+
+
+def test_avg_order_skips_missing_sales():
+    df = pd.DataFrame({"Order Date": pd.to_datetime(["2016-01-04", "2016-01-05", "2016-02-01", "2016-02-02"]),
+                       "Region": pd.Categorical(["East", "East", "West", "West"]),
+                       "Category": pd.Categorical(["Technology"] * 4),
+                       "Sales": [100.0, np.nan, 50.0, 30.0]})
+    ds = engine.Dataset(df, cubes.aggregate(df), {})
+    k = ds.view().kpis()
+    assert k.orders == 4
+    assert k.avg_order == df["Sales"].mean()
+    assert ds.view(selections={"Region": ["East"]}).kpis().avg_order == 100.0
+
+
+def test_profit_mean_skips_missing_profit():
+    df = pd.DataFrame({"Order Date": pd.to_datetime(["2016-01-04", "2016-01-05", "2016-02-01", "2016-02-20"]),
+                       "Region": pd.Categorical(["East", "East", "West", "West"]),
+                       "Sales": [100.0, 20.0, 50.0, 30.0], "Profit": [10.0, np.nan, -4.0, 6.0]})
+    ds = engine.Dataset(df, cubes.aggregate(df), {})
+    assert ds.view().profit_mean() == df["Profit"].mean()
+    # the partial month at the range's end comes from the rows
+    rng = (pd.Timestamp("2016-01-01").date(), pd.Timestamp("2016-02-10").date())
+    assert ds.view(rng).profit_mean() == 3.0
+    assert ds.view(selections={"Region": ["East"]}).profit_mean() == 10.0
+    assert engine.Dataset(df.assign(Profit=np.nan), cubes.aggregate(df.assign(Profit=np.nan)), {}) \
+        .view().profit_mean() is None
@@ -0,0 +1,41 @@
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+from superstore.export import FORMATS, export
+
+
+@pytest.fixture
+def rows():
+    n = 250
+    return pd.DataFrame({"Order ID": [f"CA-{i:05d}" for i in range(n)],
+                         "Order Date": pd.date_range("2016-01-01", periods=n, freq="D"),
+                         "Region": pd.Categorical(np.resize(["East", "West", None], n)),
+                         "Sales": np.linspace(0, 999.5, n)})
+
+
+def read_back(data, fmt):
+    if fmt == "Parquet":
+        return pd.read_parquet(io.BytesIO(data))
+    if fmt == "CSV (gzip)":
+        data = gzip.decompress(data)
+    return pd.read_csv(io.BytesIO(data), parse_dates=["Order Date"])
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_export_is_accepted_by_download_button(rows, fmt):
+    with export(rows, fmt, chunk_rows=100) as f:  # several chunks
+        data, _ = convert_data_to_bytes_and_infer_mime(f, TypeError("unsupported"))
+    got = read_back(data, fmt)
+    pd.testing.assert_frame_equal(got, rows, check_dtype=False, check_categorical=False)
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_export_empty_frame(rows, fmt):
+    with export(rows.iloc[:0], fmt) as f:
+        data, _ = convert_data_to_bytes_and_infer_mime(f, TypeError("unsupported"))
+    assert list(read_back(data, fmt).columns) == list(rows.columns)
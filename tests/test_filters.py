@@ -0,0 +1,57 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore.filters import FilterIndex
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(3)
+    n = 400
+    dates = pd.Series(pd.to_datetime("2016-01-01") + pd.to_timedelta(rng.integers(0, 366, n), "D"))
+    dates[rng.random(n) < .05] = pd.NaT
+    region = pd.Series(rng.choice(["East", "West", "South"], n), dtype="category")
+    region[rng.random(n) < .05] = np.nan
+    return pd.DataFrame({"Order Date": dates, "Region": region,
+                         "Category": rng.choice(["Furniture", "Technology"], n)})
+
+
+def baseline(df, date_range, selections):
+    """The app's original pandas filter."""
+    out = df
+    if date_range:
+        out = out[(out["Order Date"].dt.date >= date_range[0]) & (out["Order Date"].dt.date <= date_range[1])]
+    for col, values in selections.items():
+        if values:
+            out = out[out[col].isin(values)]
+    return out.index.to_numpy()
+
+
+ALL = ["East", "South", "West"]
+CASES = [
+    (None, {}),
+    (None, {"Region": ALL}),  # every value selected still drops missing regions
+    (None, {"Region": ["East"], "Category": ["Technology"]}),
+    ((dt.date(2015, 1, 1), dt.date(2017, 12, 31)), {}),  # covers every date: drops NaT only
+    ((dt.date(2016, 3, 1), dt.date(2016, 3, 31)), {"Region": ALL}),
+    ((dt.date(2016, 12, 31), dt.date(2016, 12, 31)), {"Category": ["Furniture", "Technology"]}),
+    ((dt.date(2020, 1, 1), dt.date(2020, 2, 1)), {}),
+    (None, {"Region": ["North"]}),
+]
+
+
+@pytest.mark.parametrize("date_range, selections", CASES)
+def test_mask_matches_pandas_filter(rows, date_range, selections):
+    mask = FilterIndex(rows).mask(date_range, selections)
+    got = rows.index.to_numpy() if mask is None else np.flatnonzero(mask)
+    np.testing.assert_array_equal(got, baseline(rows, date_range, selections))
+
+
+def test_no_filter_when_nothing_is_dropped(rows):
+    complete = rows.dropna()
+    ix = FilterIndex(complete)
+    assert ix.mask((dt.date(2015, 1, 1), dt.date(2017, 12, 31)), {"Region": ALL}) is None
+    assert ix.mask(None, {"Region": []}) is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore import grid
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(11)
+    n = 300
+    order_id = pd.Series([f"CA-{i:04d}" for i in rng.integers(0, 120, n)], dtype="string")
+    order_id[rng.random(n) < .1] = pd.NA
+    sales = rng.gamma(2, 100, n).round(1)
+    sales[rng.random(n) < .1] = np.nan
+    dates = pd.Series(pd.to_datetime("2016-01-01") + pd.to_timedelta(rng.integers(0, 60, n), "D"))
+    dates[rng.random(n) < .1] = pd.NaT
+    region = pd.Series(rng.choice(["West", "East", "South"], n), dtype="category")
+    region[rng.random(n) < .1] = np.nan
+    return pd.DataFrame({"Order ID": order_id, "Order Date": dates, "Region": region, "Sales": sales,
+                         "Product Name": rng.choice(["Desk Lamp", "Stapler", "Office Chair", None], n)})
+
+
+def expected(df, rows, col, descending):
+    return (df.iloc[rows].reset_index(drop=True)
+            .sort_values(col, ascending=not descending, kind="stable", na_position="last")
+            .index.to_numpy())
+
+
+@pytest.mark.parametrize("col", ["Order ID", "Order Date", "Region", "Sales", "Product Name"])
+@pytest.mark.parametrize("descending", [False, True])
+def test_sort_matches_sort_values(rows, col, descending):
+    sub = grid.positions(rows["Sales"].notna().to_numpy() | (np.arange(len(rows)) % 3 == 0), len(rows))
+    got = grid.select_rows(rows, sub, sort_by=col, descending=descending)
+    np.testing.assert_array_equal(got, sub[expected(rows, sub, col, descending)])
+
+
+def test_search_then_sort(rows):
+    cols = ["Order ID", "Region", "Product Name"]
+    got = grid.select_rows(rows, grid.positions(None, len(rows)), "st", cols, "Sales", True)
+    hit = np.zeros(len(rows), bool)
+    for c in cols:
+        hit |= rows[c].astype("string").str.contains("st", case=False, regex=False).fillna(False).to_numpy()
+    sub = np.flatnonzero(hit)
+    assert len(sub)
+    np.testing.assert_array_equal(got, sub[expected(rows, sub, "Sales", True)])
+
+
+def test_pages_cover_rows_once(rows):
+    sub = grid.select_rows(rows, grid.positions(None, len(rows)), sort_by="Order ID")
+    cols = ["Order ID", "Sales"]
+    pages = [grid.page(rows, sub, cols, i, 50) for i in range(-(-len(sub) // 50))]
+    assert [len(p) for p in pages] == [50] * 6
+    pd.testing.assert_frame_equal(pd.concat(pages, ignore_index=True),
+                                  rows.iloc[sub][cols].reset_index(drop=True))
+    assert grid.page(rows, sub, cols, 6, 50).empty
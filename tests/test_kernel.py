@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore import kernel
+
+EDGES, LABELS = [0, .1, .2, .3, .5, 1.0], ["0-10%", "10-20%", "20-30%", "30-50%", "50%+"]
+
+
+@pytest.fixture
+def rows():
+    rng = np.random.default_rng(7)
+    n = 500
+    region = pd.Categorical(rng.choice(["East", "West", "South", "Central"], n),
+                            categories=["Central", "East", "North", "South", "West"])  # North unobserved
+    region[rng.random(n) < .05] = np.nan
+    state = rng.choice(["Ohio", "Utah", "Iowa", None], n).astype(object)
+    sales = rng.gamma(2, 100, n)
+    sales[rng.random(n) < .05] = np.nan
+    return pd.DataFrame({"Region": region, "State": state, "Sales": sales,
+                         "Quantity": rng.integers(1, 10, n),
+                         "Discount": rng.choice([0, .05, .1, .2, .45, .8, 1.0, 1.5, -.1, np.nan], n)})
+
+
+def expected(df, by, measures):
+    return df.groupby(by, observed=True)[measures].sum().reset_index()
+
+
+@pytest.mark.parametrize("by", ["Region", "State", ["Region", "State"]])
+def test_group_matches_groupby_sum(rows, by):
+    got = kernel.group(rows, by, ["Sales", "Quantity"])
+    exp = expected(rows, by, ["Sales", "Quantity"])
+    pd.testing.assert_frame_equal(got, exp, check_dtype=False, check_categorical=False)
+    assert got["Quantity"].dtype == "int64"
+
+
+def test_group_under_mask_count_and_mean(rows):
+    mask = (rows["Sales"] > 150).to_numpy()
+    got = kernel.group(rows, "Region", ["Sales"], mask, count="n")
+    sub = rows[mask]
+    exp = sub.groupby("Region", observed=True).agg(Sales=("Sales", "sum"), n=("Sales", "size")).reset_index()
+    pd.testing.assert_frame_equal(got, exp, check_dtype=False, check_categorical=False)
+
+    got = kernel.group(rows, "State", ["Sales"], mean=True)
+    exp = rows.groupby("State")["Sales"].mean().reset_index()
+    pd.testing.assert_frame_equal(got, exp, check_dtype=False)
+
+
+def test_group_empty_input(rows):
+    got = kernel.group(rows, "Region", ["Sales"], np.zeros(len(rows), bool))
+    assert list(got.columns) == ["Region", "Sales"] and got.empty
+    got = kernel.group(rows.iloc[:0], "State", ["Sales"])
+    assert got.empty
+
+
+def test_matrix_matches_pivot_table(rows):
+    got = kernel.matrix(rows, "Region", "State", "Sales")
+    exp = rows.pivot_table("Sales", "Region", "State", aggfunc="sum", observed=True).fillna(0)
+    pd.testing.assert_frame_equal(got, exp, check_names=False, check_categorical=False,
+                                  check_index_type=False, check_column_type=False)
+
+
+def test_cut_matches_pd_cut(rows):
+    got = kernel.cut(rows["Discount"], EDGES, LABELS)
+    exp = pd.cut(rows["Discount"], EDGES, labels=LABELS, include_lowest=True)
+    pd.testing.assert_series_equal(got, exp)
+    # 0 lands in the first band; below, above and NaN in none
+    assert kernel.bins(np.array([0, 1.0, -.1, 1.5, np.nan]), EDGES).tolist() == [0, 4, -1, -1, -1]
+
+
+def test_distinct_matches_nunique(rows):
+    assert kernel.distinct(rows["State"]) == rows["State"].nunique()
+    mask = (rows["Sales"] > 300).to_numpy()
+    assert kernel.distinct(rows["Region"], mask) == rows.loc[mask, "Region"].nunique()
+    assert kernel.distinct(rows["Region"], np.zeros(len(rows), bool)) == 0
@@ -0,0 +1,58 @@
+import gc
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore import cube as cubes, engine, parallel
+from superstore.registry import Registry
+
+
+@pytest.fixture
+def columns(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel, "COLUMNS_DIR", tmp_path / "columns")
+    return tmp_path / "columns"
+
+
+@pytest.fixture
+def ds():
+    rng = np.random.default_rng(5)
+    n = 200
+    df = pd.DataFrame({"Order Date": pd.to_datetime("2016-01-01") + pd.to_timedelta(rng.integers(0, 90, n), "D"),
+                       "Region": pd.Categorical(rng.choice(["East", "West"], n)),
+                       "Sales": rng.gamma(2, 100, n), "Profit": rng.normal(10, 30, n)})
+    return engine.Dataset(df, cubes.aggregate(df), {})
+
+
+def test_dump_deleted_on_registry_eviction(columns, ds):
+    reg = Registry(maxsize=1)
+    root = reg.get(("parallel", "upload", "a"), lambda: parallel.Dataset(ds, "a")).root
+    assert sorted(p.name for p in root.iterdir()) == ["Order Date.npy", "Profit.npy", "Region.npy", "Sales.npy"]
+    held = reg.get(("parallel", "upload", "b"), lambda: parallel.Dataset(ds, "b"))  # evicts "a"
+    gc.collect()
+    assert [p.name for p in columns.iterdir()] == [held.root.name]
+
+
+def test_dump_kept_while_a_view_uses_it(columns, ds):
+    view = parallel.Dataset(ds, "a").view()
+    gc.collect()
+    assert view.par.root.is_dir()
+    root, view = view.par.root, None
+    gc.collect()
+    assert not root.exists()
+
+
+def test_prune_leftovers_past_cap(columns, ds):
+    columns.mkdir()
+    for age, name in [(100, "old"), (200, "older")]:
+        (columns / name).mkdir()
+        (columns / name / "Sales.npy").write_bytes(b"x" * 1000)
+        os.utime(columns / name, (time.time() - age,) * 2)
+    live = parallel.Dataset(ds, "a")
+    size = sum(p.stat().st_size for p in live.root.iterdir())
+    parallel.prune(max_bytes=size + 1500)  # room for one leftover: the older goes
+    assert sorted(p.name for p in columns.iterdir()) == sorted([live.root.name, "old"])
+    parallel.prune(max_bytes=0)  # never the dump in use
+    assert [p.name for p in columns.iterdir()] == [live.root.name]
@@ -0,0 +1,61 @@
+import datetime as dt
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.generate import chunk
+from superstore import partitions
+from superstore.ingest import read_csv
+
+
+def extract(seed, start, first_id, undated=0):
+    rows = chunk(np.random.default_rng(seed), 400, pd.Timestamp(start), 90, first_id)
+    rows.loc[rows.index[:undated], "Order Date"] = None
+    return rows.to_csv(index=False).encode()
+
+
+@pytest.fixture
+def root(tmp_path):
+    for csv in [extract(1, "2016-01-01", 1, undated=5), extract(2, "2016-03-01", 401)]:
+        partitions.add(io.BytesIO(csv), tmp_path)
+    return tmp_path
+
+
+def expected(*csvs):
+    df = pd.concat([read_csv(io.BytesIO(c))[0] for c in csvs], ignore_index=True)
+    return df.sort_values("Row ID").reset_index(drop=True)
+
+
+def test_round_trip(root):
+    df, mem = partitions.read(partitions.files(root))
+    got = df.sort_values("Row ID").reset_index(drop=True)
+    want = expected(extract(1, "2016-01-01", 1, undated=5), extract(2, "2016-03-01", 401))
+    pd.testing.assert_frame_equal(got, want, check_dtype=False, check_categorical=False)
+    assert mem["raw_bytes"] > 0
+    assert len(list((root / partitions.UNDATED).glob("*.arrow"))) == 1
+
+
+def test_files_prune_to_the_date_range(root):
+    assert partitions.bounds(root) == (dt.date(2016, 1, 1), dt.date(2016, 5, 31))
+    paths = partitions.files(root, dt.date(2016, 2, 15), dt.date(2016, 3, 10))
+    assert sorted({p.parent.name for p in paths}) == ["month=02", "month=03"]
+    assert len(paths) == 3  # March holds a file of each extract
+    df, _ = partitions.read(paths)
+    assert df["Order Date"].dt.month.isin([2, 3]).all()
+
+
+def test_readding_an_extract_replaces_its_files(root):
+    before = len(partitions.read(partitions.files(root))[0])
+    partitions.add(io.BytesIO(extract(2, "2016-03-01", 401)), root)
+    assert len(partitions.read(partitions.files(root))[0]) == before
+
+
+def test_fingerprint_stable_until_a_partition_changes(root):
+    paths = partitions.files(root)
+    fp = partitions.fingerprint(paths)
+    assert partitions.fingerprint(partitions.files(root)) == fp
+    assert partitions.fingerprint(partitions.files(root, dt.date(2016, 1, 1), dt.date(2016, 1, 31))) != fp
+    partitions.add(io.BytesIO(extract(2, "2016-03-01", 401)), root)  # rewritten: new mtimes
+    assert partitions.fingerprint(partitions.files(root)) != fp
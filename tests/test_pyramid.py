@@ -0,0 +1,80 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from superstore import pyramid
+
+# level → pandas offset of the same periods (weeks start on Monday)
+FREQ = {"Day": "D", "Week": "W-MON", "Month": "MS", "Quarter": "QS", "Year": "YS"}
+
+
+@pytest.fixture(scope="module")
+def rows():
+    rng = np.random.default_rng(4)
+    n = 5000
+    dates = pd.Series(pd.to_datetime("2014-01-01") + pd.to_timedelta(rng.integers(0, 4 * 365, n), "D")
+                      + pd.to_timedelta(rng.integers(0, 86400, n), "s"))
+    dates[rng.random(n) < .02] = pd.NaT
+    region = pd.Series(rng.choice(["East", "West", "South", "Central"], n), dtype="category")
+    region[rng.random(n) < .03] = np.nan
+    sales = rng.gamma(2, 100, n)
+    sales[rng.random(n) < .03] = np.nan
+    return pd.DataFrame({"Order Date": dates, "Region": region,
+                         "Category": pd.Categorical(rng.choice(["Furniture", "Technology"], n)),
+                         "Sales": sales, "Profit": rng.normal(10, 40, n)})
+
+
+@pytest.fixture(scope="module")
+def pyr(rows):
+    return pyramid.Pyramid(pyramid.days(rows))
+
+
+def resampled(rows, level, date_range, selections):
+    """The same trend from a pandas resample of the filtered rows."""
+    sub = rows
+    if date_range:
+        d = sub["Order Date"].dt.date
+        sub = sub[(d >= date_range[0]) & (d <= date_range[1])]
+    for col, values in (selections or {}).items():
+        sub = sub[sub[col].isin(values)]
+    freq = FREQ[level]
+    out = sub.resample(freq, on="Order Date", closed="left", label="left").agg(
+        Sales=("Sales", "sum"), Profit=("Profit", "sum"), Orders=("Sales", "size"))
+    return out[out["Orders"] > 0].rename_axis("Period").reset_index()
+
+
+CASES = [
+    (None, None),
+    ((dt.date(2015, 2, 11), dt.date(2016, 11, 3)), None),  # partial periods at both ends
+    ((dt.date(2014, 1, 1), dt.date(2017, 12, 31)), {"Region": ["East", "West"]}),
+    ((dt.date(2016, 7, 4), dt.date(2016, 7, 4)), {"Category": ["Technology"]}),
+]
+
+
+@pytest.mark.parametrize("level", list(pyramid.LEVELS))
+@pytest.mark.parametrize("date_range, selections", CASES)
+def test_trend_matches_resample(rows, pyr, level, date_range, selections):
+    got = pyr.trend(level, date_range, selections)
+    pd.testing.assert_frame_equal(got, resampled(rows, level, date_range, selections),
+                                  check_dtype=False, check_freq=False, rtol=1e-9)
+
+
+def test_chunked_day_tables_merge_exactly(rows, pyr):
+    parts = [pyramid.days(rows.iloc[i:i + 1500]) for i in range(0, len(rows), 1500)]
+    merged = pyramid.Pyramid(pyramid.merge(parts))
+    for level in pyramid.LEVELS:
+        pd.testing.assert_frame_equal(merged.trend(level), pyr.trend(level), rtol=1e-9)
+
+
+def test_split_and_period():
+    whole, edges = pyramid.split((dt.date(2016, 1, 15), dt.date(2016, 5, 10)), "Month")
+    assert whole == (dt.date(2016, 2, 1), dt.date(2016, 4, 30))
+    assert edges == [(dt.date(2016, 1, 15), dt.date(2016, 1, 31)), (dt.date(2016, 5, 1), dt.date(2016, 5, 10))]
+    assert pyramid.split((dt.date(2016, 1, 15), dt.date(2016, 1, 20)), "Month") == \
+        (None, [(dt.date(2016, 1, 15), dt.date(2016, 1, 20))])
+    assert pyramid.period(dt.date(2016, 7, 7), "Week") == (dt.date(2016, 7, 4), dt.date(2016, 7, 10))
+    assert pyramid.period(dt.date(2016, 8, 31), "Quarter") == (dt.date(2016, 7, 1), dt.date(2016, 9, 30))
+    assert pyramid.auto(dt.date(2016, 1, 1), dt.date(2016, 3, 31)) == "Day"
+    assert pyramid.auto(dt.date(2014, 1, 1), dt.date(2017, 12, 31)) == "Month"
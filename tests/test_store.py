@@ -0,0 +1,68 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bench.generate import chunk
+from superstore import store
+from superstore.ingest import read_csv
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "CACHE_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def csv():
+    rows = chunk(np.random.default_rng(1), 500, pd.Timestamp("2016-01-01"), 365, 1)
+    return rows.to_csv(index=False).encode()
+
+
+class Reader:
+    """read_csv, counting the parses."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, f):
+        self.calls += 1
+        return read_csv(f)
+
+
+def test_second_load_is_read_from_disk(csv):
+    reader = Reader()
+    df, mem = store.load(io.BytesIO(csv), reader=reader)
+    again, mem2 = store.load(io.BytesIO(csv), reader=reader)
+    assert reader.calls == 1
+    pd.testing.assert_frame_equal(again, df)
+    assert mem2["raw_bytes"] == mem["raw_bytes"]
+
+
+def test_changed_content_misses(csv, cache_dir):
+    reader = Reader()
+    store.load(io.BytesIO(csv), reader=reader)
+    edited = csv.replace(b"Standard Class", b"Same Day", 1)
+    df, _ = store.load(io.BytesIO(edited), reader=reader)
+    assert reader.calls == 2
+    assert len(list(cache_dir.glob("*.arrow"))) == 2
+    assert store.content_hash(io.BytesIO(edited)) != store.content_hash(io.BytesIO(csv))
+    pd.testing.assert_frame_equal(df, read_csv(io.BytesIO(edited))[0])
+
+
+def test_corrupt_entry_is_rebuilt(csv):
+    f, reader = io.BytesIO(csv), Reader()
+    store.cache_path(store.content_hash(f)).write_bytes(b"not arrow")
+    df, _ = store.load(f, reader=reader)
+    assert reader.calls == 1 and len(df) == 500
+    store.load(f, reader=reader)
+    assert reader.calls == 1
+
+
+def test_content_hash_rewinds():
+    f = io.BytesIO(b"a,b\n1,2\n")
+    f.read(3)
+    digest = store.content_hash(f)
+    assert f.tell() == 0 and digest == store.content_hash(io.BytesIO(b"a,b\n1,2\n"))